@@ -0,0 +1,226 @@
+"""
+Materialized views of the derived frames the homepage draws from.
+
+None of these frames depend on widget state, so they are computed once per
+version of their source data instead of on every rerun. A view's version is a
+hash of the content digests of the datasets it reads (plus VIEWS_VERSION, to
+be bumped whenever a view definition changes). Built views are kept in memory
+for the process and persisted under data/aggregates/<version>/ so a fresh
+process can pick them up without recomputing; writing a view removes its
+copies of other versions.
+
+Precompute every view with:
+
+    python Dashboard/aggregates.py
+"""
+import hashlib
+import os
+import threading
+
+import pandas as pd
+
+import data_loader
+import snapshots
+from instrumentation import measured
+from streaming import stream_sum
+
+
+VIEWS_VERSION = "3"
+
+STORE_DIR = os.path.join(data_loader.DATA_DIR, "aggregates")
+
+
+# ------------------------------------
+# View definitions
+
+def _top20_countries(df_aqitpcr):
+    top_10_country = df_aqitpcr.head(20).copy()
+    top_10_country['Rank_new'] = 21-top_10_country['Rank']
+    return top_10_country
+
+
+def _top11_17_yearly(df_aqitpcr):
+    top_10_country = df_aqitpcr.head(17).copy().iloc[11:18,:]
+    top_10_country['Rank'] = 18-top_10_country['Rank']
+
+    # Deleting unnecesary Columns
+    top_10_country.drop(['Population'], axis=1, inplace=True)
+
+    # Converting wide to long format
+    top_10_country = top_10_country.melt(id_vars=['Rank', 'Country/Region'],
+                                var_name="Year",
+                                value_name="AQI")
+
+    top_10_country.sort_values(['Rank','Year'], ascending=[False, True], inplace=True)
+    top_10_country['AQI'] = top_10_country['AQI'].astype(float)
+
+    # For Plotting purose filling missing values with the backfill process
+    top_10_country.fillna(method="bfill", inplace=True)
+    return top_10_country
+
+
+def _top10_population(df_aqitpcr):
+    return df_aqitpcr.sort_values(['Population'], ascending=False).head(10).copy()
+
+
+def _energy_by_year(elecdt):
+    return elecdt.groupby("Year").agg({
+        "Fossil_Energy":"sum",
+        "Nuclear_Energy":"sum",
+        "Renewable_Electricity":"sum"
+    }).reset_index()
+
+
+def energy_mix_frame(energygb):
+    # yearly sums per energy type in long format, for the area chart
+    return pd.melt(energygb, id_vars=['Year'], value_vars=['Fossil_Energy', 'Nuclear_Energy','Renewable_Electricity'],
+            var_name='Energy Type', value_name='Energy').sort_values(["Year","Energy Type"]).reset_index(drop=True)
+
+
+def _energy_mix(elecdt):
+    return energy_mix_frame(_energy_by_year(elecdt))
+
+
+def _co2_by_year(co2ann_path):
+    # streamed: the per-region file is never fully resident, only yearly sums
+    co2ann = stream_sum(co2ann_path, by="Year", values='Annual CO2 emissions (zero filled)',
+                        bounds={"Year": (1900, None)})
+    return co2ann.rename(columns={'Annual CO2 emissions (zero filled)':"Co2Emissions"})
+
+
+def _co2_by_region_year(co2ann_path):
+    # streamed like _co2_by_year, kept per region for range_sums.py
+    co2ann = stream_sum(co2ann_path, by=["Entity", "Year"], values='Annual CO2 emissions (zero filled)',
+                        bounds={"Year": (1900, None)})
+    return co2ann.rename(columns={'Annual CO2 emissions (zero filled)':"Co2Emissions"})
+
+
+def _gdp_co2_join(gdp, co2pc):
+    gdp = gdp.rename(columns={"Country Name":"Country"})
+    co2pc = co2pc.rename(columns={
+        "Value":"Co2_p",
+        "Attribute":"Year",
+        "Country Name":"Country"
+    })
+    return gdp.merge(co2pc, how='inner', on=['Country', 'Year'])
+
+
+# view name -> (source datasets, builder called with those frames in order)
+# Builders listed in STREAMED get the source file paths instead of the frames.
+VIEWS = {
+    "top20_countries": (("aqi_countries",), _top20_countries),
+    "top11_17_yearly": (("aqi_countries",), _top11_17_yearly),
+    "top10_population": (("aqi_countries",), _top10_population),
+    "energy_mix": (("electricity",), _energy_mix),
+    "co2_by_year": (("co2_annual",), _co2_by_year),
+    "co2_by_region_year": (("co2_annual",), _co2_by_region_year),
+    "gdp_co2": (("gdp", "co2_per_capita"), _gdp_co2_join),
+}
+
+STREAMED = {"co2_by_year", "co2_by_region_year"}
+
+
+# ------------------------------------
+# Store
+
+_lock = threading.Lock()
+_memory = {}  # name -> (version, frame)
+
+
+def data_version(*datasets):
+    """Hash of the content of ``datasets`` (and of the view definitions)."""
+    h = hashlib.sha1(VIEWS_VERSION.encode())
+    for name in datasets:
+        h.update(name.encode())
+        h.update(data_loader.dataset_digest(name).encode())
+    return h.hexdigest()[:16]
+
+
+def view_version(name):
+    return data_version(*VIEWS[name][0])
+
+
+def _view_path(name, version):
+    return os.path.join(STORE_DIR, version, name + ".feather")
+
+
+def _read_stored(name, version):
+    path = _view_path(name, version)
+    if not snapshots.available() or not os.path.exists(path):
+        return None
+    try:
+        return snapshots.feather.read_table(path, memory_map=True).to_pandas()
+    except (OSError, snapshots.pa.ArrowInvalid):
+        return None
+
+
+def _write_stored(name, version, frame):
+    if not snapshots.available():
+        return
+    path = _view_path(name, version)
+    try:
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        snapshots.feather.write_feather(frame.reset_index(drop=True), path + ".tmp", compression="uncompressed")
+        os.replace(path + ".tmp", path)
+    except OSError:
+        return
+    _prune(name, version)
+
+
+def _prune(name, version):
+    # drop ``name`` from the directories of other versions, and those left empty
+    for other in os.listdir(STORE_DIR):
+        if other == version:
+            continue
+        directory = os.path.join(STORE_DIR, other)
+        try:
+            os.remove(os.path.join(directory, name + ".feather"))
+        except OSError:
+            pass
+        try:
+            os.rmdir(directory)
+        except OSError:
+            pass  # not empty, still holds other views
+
+
+def compute_view(name):
+    sources, builder = VIEWS[name]
+    if name in STREAMED:
+        return builder(*[data_loader.dataset_path(source) for source in sources])
+    return builder(*[data_loader.load_dataset(source) for source in sources])
+
+
+@measured("load")
+def get_view(name):
+    """Return the precomputed view ``name`` for the current source data.
+
+    Like the loaded datasets, views are shared between sessions: copy before
+    mutating.
+    """
+    version = view_version(name)
+    with _lock:
+        cached = _memory.get(name)
+        if cached is not None and cached[0] == version:
+            return cached[1]
+
+        frame = _read_stored(name, version)
+        if frame is None:
+            frame = compute_view(name).reset_index(drop=True)
+            _write_stored(name, version, frame)
+        _memory[name] = (version, frame)
+        return frame
+
+
+def build_all():
+    """Compute and persist every view; returns {name: version}."""
+    built = {}
+    for name in VIEWS:
+        version = view_version(name)
+        _write_stored(name, version, compute_view(name).reset_index(drop=True))
+        built[name] = version
+    return built
+
+
+if __name__ == "__main__":
+    for name, version in build_all().items():
+        print(f"{name} -> {_view_path(name, version)}")
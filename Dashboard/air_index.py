@@ -0,0 +1,187 @@
+"""
+Batch air quality index calculator from raw pollutant concentrations.
+
+Each standard is a set of breakpoint tables, one per pollutant, mapping a
+concentration range [C_lo, C_hi] onto an index range [I_lo, I_hi]. A column
+of concentrations is located in its table with ``np.searchsorted`` and
+interpolated linearly inside its segment, so sub-indices for millions of rows
+come out of a handful of array operations. ``compute()`` then derives the
+clean-file columns the dashboard uses: ``Max`` (the highest sub-index),
+``Critical Component`` (the pollutant(s) reaching it, joined with ", " on
+ties) and ``Category``.
+
+Two standards are provided:
+
+* ``ISPU``: Indonesian Indeks Standar Pencemar Udara (PermenLHK
+  P.14/2020), concentrations in ug/m3.
+* ``EPA``: US EPA AQI (2024 PM2.5 revision), concentrations in the units of
+  the EPA tables (ug/m3 for particles, ppm for O3 and CO, ppb for SO2/NO2).
+  Concentrations are truncated to the precision of the table before lookup,
+  which is how the EPA ranges are meant to be read.
+
+Concentrations above the last breakpoint are clamped to the top of the scale;
+negative or missing concentrations give a NaN sub-index and are ignored by
+``Max``.
+"""
+import sys
+
+import numpy as np
+import pandas as pd
+
+
+class Breakpoints:
+    """Piecewise-linear map from concentration to index for one pollutant."""
+
+    def __init__(self, c_lo, c_hi, i_lo, i_hi, decimals=None):
+        self.c_lo = np.asarray(c_lo, dtype=np.float64)
+        self.c_hi = np.asarray(c_hi, dtype=np.float64)
+        self.i_lo = np.asarray(i_lo, dtype=np.float64)
+        self.i_hi = np.asarray(i_hi, dtype=np.float64)
+        self.decimals = decimals
+        # I = offset + slope * C inside each segment, so a lookup is two gathers
+        self._slope = (self.i_hi - self.i_lo) / (self.c_hi - self.c_lo)
+        self._offset = self.i_lo - self._slope * self.c_lo
+
+    @classmethod
+    def continuous(cls, concentrations, indices):
+        """Segments between consecutive breakpoints (the ISPU layout)."""
+        return cls(concentrations[:-1], concentrations[1:], indices[:-1], indices[1:])
+
+    def __call__(self, values):
+        c = np.asarray(values, dtype=np.float64)
+        if self.decimals is not None:
+            scale = 10.0 ** self.decimals
+            # truncate (not round), with a nudge so 9.1 stays 9.1 after the float product
+            c = np.floor(c * scale + 1e-9) / scale
+        c = np.minimum(c, self.c_hi[-1])
+        # c_lo[0] is 0, so only negative (invalid) values land before the first segment
+        segment = np.searchsorted(self.c_lo[1:], c, side="right")
+        index = np.floor(self._offset[segment] + self._slope[segment] * c + 0.5)
+        index[~(c >= 0)] = np.nan
+        return index
+
+
+class Standard:
+    def __init__(self, name, tables, bounds, labels):
+        self.name = name
+        self.tables = tables
+        self.bounds = np.asarray(bounds, dtype=np.float64)  # upper index bound of each category
+        self.labels = list(labels)
+
+    @property
+    def pollutants(self):
+        return list(self.tables)
+
+    def category(self, index):
+        """Ordered categorical of the category each index value falls in."""
+        index = np.asarray(index, dtype=np.float64)
+        codes = np.searchsorted(self.bounds, index, side="left")
+        codes = np.minimum(codes, len(self.labels) - 1)
+        codes[np.isnan(index)] = -1
+        return pd.Categorical.from_codes(codes, categories=self.labels, ordered=True)
+
+    def table(self):
+        """Index ranges and their categories, as shown on the homepage."""
+        lows = np.concatenate([[0], self.bounds[:-1] + 1]).astype(int)
+        return pd.DataFrame({
+            "index": [f"{lo}-{int(hi)}" for lo, hi in zip(lows, self.bounds)],
+            "category": self.labels,
+        })
+
+
+ISPU = Standard(
+    "ISPU",
+    {
+        "PM10": Breakpoints.continuous([0, 50, 150, 350, 420, 500], [0, 50, 100, 200, 300, 500]),
+        "PM2.5": Breakpoints.continuous([0, 15.5, 55.4, 150.4, 250.4, 500], [0, 50, 100, 200, 300, 500]),
+        "SO2": Breakpoints.continuous([0, 52, 180, 400, 800, 1200], [0, 50, 100, 200, 300, 500]),
+        "CO": Breakpoints.continuous([0, 4000, 8000, 15000, 30000, 45000], [0, 50, 100, 200, 300, 500]),
+        "O3": Breakpoints.continuous([0, 120, 235, 400, 800, 1000], [0, 50, 100, 200, 300, 500]),
+        "NO2": Breakpoints.continuous([0, 80, 200, 1130, 2260, 3000], [0, 50, 100, 200, 300, 500]),
+        "HC": Breakpoints.continuous([0, 45, 100, 215, 432, 648], [0, 50, 100, 200, 300, 500]),
+    },
+    bounds=[50, 100, 200, 300, 500],
+    labels=["Good", "Moderate", "Unhealthy", "Very Unhealthy", "Hazardous"],
+)
+
+_EPA_INDEX = ([0, 51, 101, 151, 201, 301], [50, 100, 150, 200, 300, 500])
+
+EPA = Standard(
+    "EPA",
+    {
+        "PM2.5": Breakpoints([0.0, 9.1, 35.5, 55.5, 125.5, 225.5],
+                             [9.0, 35.4, 55.4, 125.4, 225.4, 325.4], *_EPA_INDEX, decimals=1),
+        "PM10": Breakpoints([0, 55, 155, 255, 355, 425],
+                            [54, 154, 254, 354, 424, 604], *_EPA_INDEX, decimals=0),
+        # 8-hour O3, which the EPA does not define above 0.200 ppm
+        "O3": Breakpoints([0.000, 0.055, 0.071, 0.086, 0.106],
+                          [0.054, 0.070, 0.085, 0.105, 0.200],
+                          _EPA_INDEX[0][:5], _EPA_INDEX[1][:5], decimals=3),
+        "CO": Breakpoints([0.0, 4.5, 9.5, 12.5, 15.5, 30.5],
+                          [4.4, 9.4, 12.4, 15.4, 30.4, 50.4], *_EPA_INDEX, decimals=1),
+        "SO2": Breakpoints([0, 36, 76, 186, 305, 605],
+                           [35, 75, 185, 304, 604, 1004], *_EPA_INDEX, decimals=0),
+        "NO2": Breakpoints([0, 54, 101, 361, 650, 1250],
+                           [53, 100, 360, 649, 1249, 2049], *_EPA_INDEX, decimals=0),
+    },
+    bounds=[50, 100, 150, 200, 300, 500],
+    labels=["Good", "Moderate", "Unhealthy for Sensitive Groups", "Unhealthy", "Very Unhealthy", "Hazardous"],
+)
+
+STANDARDS = {"ISPU": ISPU, "EPA": EPA}
+
+
+def sub_index(values, pollutant, standard=ISPU):
+    """Sub-index of each concentration in ``values`` for ``pollutant``."""
+    try:
+        table = standard.tables[pollutant]
+    except KeyError:
+        raise ValueError(f"{standard.name} has no breakpoints for {pollutant!r}, "
+                         f"expected one of {standard.pollutants}") from None
+    return table(values)
+
+
+def _critical_labels(names):
+    # label of every subset of pollutants, indexed by its bitmask
+    labels = np.empty(1 << len(names), dtype=object)
+    for mask in range(len(labels)):
+        labels[mask] = ", ".join(name for bit, name in enumerate(names) if mask >> bit & 1) or None
+    return labels
+
+
+def compute(concentrations, standard=ISPU, pollutants=None):
+    """Sub-indices, ``Max``, ``Critical Component`` and ``Category`` per row.
+
+    ``concentrations`` is a DataFrame or a mapping of pollutant -> array;
+    ``pollutants`` defaults to every column the standard has a table for.
+    """
+    if pollutants is None:
+        pollutants = [p for p in standard.pollutants if p in concentrations]
+        if not pollutants:
+            raise ValueError(f"No {standard.name} pollutant among the columns, "
+                             f"expected some of {standard.pollutants}")
+    pollutants = list(pollutants)
+    indices = np.column_stack([sub_index(concentrations[p], p, standard) for p in pollutants])
+
+    defined = ~np.isnan(indices)
+    top = np.where(defined, indices, -np.inf).max(axis=1)
+    top[~defined.any(axis=1)] = np.nan
+    critical = (indices == top[:, None]) & defined
+    masks = critical.astype(np.int64) @ (1 << np.arange(len(pollutants), dtype=np.int64))
+
+    index = concentrations.index if isinstance(concentrations, pd.DataFrame) else None
+    out = pd.DataFrame(indices, columns=pollutants, index=index)
+    out["Max"] = top
+    out["Critical Component"] = _critical_labels(pollutants)[masks]
+    out["Category"] = standard.category(top)
+    return out
+
+
+if __name__ == "__main__":
+    # python Dashboard/air_index.py <raw csv> [ISPU|EPA] > indexed.csv
+    if len(sys.argv) not in (2, 3):
+        sys.exit("usage: python Dashboard/air_index.py <csv> [ISPU|EPA]")
+    raw = pd.read_csv(sys.argv[1])
+    result = compute(raw, STANDARDS[sys.argv[2] if len(sys.argv) == 3 else "ISPU"])
+    extra = [c for c in raw.columns if c not in result.columns]
+    pd.concat([raw[extra], result], axis=1).to_csv(sys.stdout, index=False)
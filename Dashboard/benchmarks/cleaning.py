@@ -0,0 +1,84 @@
+"""
+Benchmark of the IQAir cities cleaning steps in cleaning.py against the
+notebook 01 version (replace '-', per-column round loop, row-wise split
+applies), on the raw cities export replicated ``--factor`` times.
+
+The KNN imputation is left out of both sides: it is the same call in both and
+its cost grows quadratically with the rows, so it would hide the steps this
+compares.
+
+    python Dashboard/benchmarks/cleaning.py --factor 100
+"""
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import data_loader  # noqa: E402
+from cleaning import CITY_VALUES, clean_cities, read_raw  # noqa: E402
+
+
+def legacy_clean_cities(path):
+    df_aqicty = pd.read_csv(path)
+    df_aqicty = df_aqicty.replace("-", np.nan)
+    # stands in for the KNNImputer call, which is what turned the columns to float
+    df_aqicty.iloc[:, 2:19] = df_aqicty.iloc[:, 2:19].astype("float64")
+
+    num_cols = [i for i in df_aqicty.columns if i not in ['Rank', 'City', 'country', 'city_only']]
+    for i in num_cols:
+        df_aqicty[i] = df_aqicty[i].round(decimals=2)
+
+    df_aqicty['temp'] = df_aqicty['City'].str.split(",")
+    df_aqicty['country'] = df_aqicty['temp'].apply(lambda x: x[1].strip())
+    df_aqicty['city_only'] = df_aqicty['temp'].apply(lambda x: x[0].strip())
+    df_aqicty.drop('temp', axis=1, inplace=True)
+    df_aqicty.iloc[:, 3:19] = df_aqicty.iloc[:, 3:19].astype("float64")
+    return df_aqicty.reset_index(drop=True)
+
+
+def vectorized_clean_cities(path):
+    return clean_cities(read_raw("aqi_cities_raw", path), fill=lambda frame, columns: frame)
+
+
+def timed(fn, repeat):
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = fn()
+        best = min(best, time.perf_counter() - start)
+    return best, result
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--factor", type=int, default=100)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args(argv)
+
+    with open(data_loader.dataset_path("aqi_cities_raw"), newline="") as f:
+        header, *rows = f.read().splitlines()
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "cities.csv")
+        with open(path, "w", newline="") as f:
+            f.write(header + "\n")
+            f.write("\n".join(rows * args.factor) + "\n")
+
+        legacy_time, legacy = timed(lambda: legacy_clean_cities(path), args.repeat)
+        vector_time, vector = timed(lambda: vectorized_clean_cities(path), args.repeat)
+
+    same = legacy.astype({c: np.float64 for c in CITY_VALUES}).equals(vector)
+    print(f"rows        {len(vector):,} ({args.factor}x)")
+    print(f"notebook    {legacy_time:.3f}s")
+    print(f"vectorized  {vector_time:.3f}s ({legacy_time / vector_time:.1f}x)")
+    print(f"identical   {same}")
+    return 0 if same else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,67 @@
+"""
+Micro-benchmark of the vectorized formatting.human_format against the per-row
+version the homepage used to apply with ``.apply(lambda x: human_format(x))``.
+
+    python Dashboard/benchmarks/human_format.py --size 1000000
+"""
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from formatting import human_format  # noqa: E402
+
+
+def legacy_human_format(num):
+    magnitude = 0
+    while abs(num) >= 1000:
+        magnitude += 1
+        num /= 1000.0
+    # add more suffixes if you need them
+    return '%.1f%s' % (num, ['', 'K', 'M', 'B', 'T', 'P'][magnitude])
+
+
+def sample_values(size, seed=0):
+    # spread over every suffix bucket, with exact bucket edges mixed in
+    rng = np.random.default_rng(seed)
+    values = 10.0 ** rng.uniform(-1, 17.9, size)
+    values[rng.random(size) < 0.1] *= -1
+    edges = np.array([0, 999, 999.94, 999.96, 1000, 1e6 - 1, 1e6, 1e9, 1e12, 1e15])
+    values[:len(edges)] = edges
+    return pd.Series(np.round(values, 2))
+
+
+def timed(fn, repeat):
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = fn()
+        best = min(best, time.perf_counter() - start)
+    return best, result
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--size", type=int, default=1_000_000)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args(argv)
+
+    values = sample_values(args.size)
+    legacy_time, legacy = timed(lambda: values.apply(lambda x: legacy_human_format(x)), args.repeat)
+    vector_time, vector = timed(lambda: human_format(values), args.repeat)
+
+    mismatches = int((legacy != vector).sum())
+    print(f"values      {args.size:,}")
+    print(f"per-row     {legacy_time:.3f}s")
+    print(f"vectorized  {vector_time:.3f}s ({legacy_time / vector_time:.1f}x)")
+    print(f"mismatches  {mismatches}")
+    return 1 if mismatches else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,87 @@
+"""
+Compares the imputers in imputation.py with sklearn's KNNImputer on the raw
+IQAir city matrix: a share of the observed cells is hidden, each imputer
+fills them back, and the mean absolute error against the hidden values is
+reported with the run time.
+
+With ``--factor N`` the matrix is also resampled to N times its rows (rows
+drawn with 10% multiplicative noise, missing-value patterns drawn from other
+rows) and only the scalable imputers are timed, since KNNImputer's pairwise
+distances grow quadratically.
+
+    python Dashboard/benchmarks/imputation.py --holdout 0.05 --factor 30
+"""
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from cleaning import CITY_MONTHS, CITY_VALUES, read_raw  # noqa: E402
+from imputation import interpolate, knn_impute  # noqa: E402
+
+
+def sklearn_knn(X):
+    from sklearn.impute import KNNImputer
+
+    return KNNImputer(n_neighbors=2).fit_transform(X)
+
+
+def months_then_tree(X):
+    months = [CITY_VALUES.index(c) for c in CITY_MONTHS]
+    X = X.copy()
+    X[:, months] = interpolate(X[:, months])
+    return knn_impute(X)
+
+
+IMPUTERS = {
+    "KNNImputer": sklearn_knn,
+    "tree": knn_impute,
+    "interpolate": months_then_tree,
+}
+
+
+def timed(fn, X):
+    start = time.perf_counter()
+    result = fn(X)
+    return time.perf_counter() - start, result
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--holdout", type=float, default=0.05, help="share of observed cells hidden")
+    parser.add_argument("--factor", type=int, default=0, help="also time the scalable imputers at N x rows")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args(argv)
+
+    rng = np.random.default_rng(args.seed)
+    X = read_raw("aqi_cities_raw")[CITY_VALUES].to_numpy(dtype=np.float64)
+    observed = np.argwhere(~np.isnan(X))
+    hidden = observed[rng.random(len(observed)) < args.holdout]
+    masked = X.copy()
+    masked[hidden[:, 0], hidden[:, 1]] = np.nan
+    truth = X[hidden[:, 0], hidden[:, 1]]
+
+    print(f"rows {len(X):,}, hidden cells {len(hidden):,}")
+    for name, fn in IMPUTERS.items():
+        seconds, filled = timed(fn, masked)
+        error = np.abs(filled[hidden[:, 0], hidden[:, 1]] - truth).mean()
+        print(f"{name:12s} MAE {error:6.3f}   {seconds:7.2f}s")
+
+    if args.factor:
+        complete = sklearn_knn(X)
+        n = len(X) * args.factor
+        big = complete[rng.integers(0, len(X), n)] * (1 + rng.normal(0, 0.1, (n, X.shape[1])))
+        big[np.isnan(X)[rng.integers(0, len(X), n)]] = np.nan
+        print(f"\nrows {n:,} ({args.factor}x), missing cells {int(np.isnan(big).sum()):,}")
+        for name in ("tree", "interpolate"):
+            seconds, filled = timed(IMPUTERS[name], big)
+            print(f"{name:12s} {seconds:7.2f}s   left missing {int(np.isnan(filled).sum())}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
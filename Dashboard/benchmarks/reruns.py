@@ -0,0 +1,346 @@
+"""
+Headless rerun benchmark of the homepage on shipped and scaled data.
+
+For each scale the homepage runs in a fresh process under Streamlit's AppTest
+(no browser, no server), reading the shipped CSVs (1x) or the synthetic copies
+of synthetic.py through DASHBOARD_DATA_DIR. After the cold first run, each
+widget interaction of INTERACTIONS is replayed ``--repeat`` times with
+changing values and reported as
+
+* ``first``: latency of its first run, which pays one-off costs (imports,
+  caches, the ISPU store) and is left out of the percentiles below;
+* ``rerun``: latency of the whole script run. AppTest reruns the full page
+  even for widgets inside fragments;
+* ``section``: time of the sections the widget belongs to, from the profile
+  records of instrumentation.py, i.e. what a fragment rerun costs in a
+  browser session;
+* ``peak``: allocation peak of the run, from a second pass over the same
+  values with tracemalloc on, so the tracing overhead stays out of the
+  latencies (``--no-memory`` skips it).
+
+The cold start reports its time and the process's peak resident memory.
+
+Results can be saved and compared with an earlier run; the comparison fails
+when the median rerun of any interaction got slower than ``--tolerance``:
+
+    python Dashboard/benchmarks/reruns.py --scales 1,10,100 --save before.json
+    python Dashboard/benchmarks/reruns.py --scales 1,10,100 --compare before.json
+
+Scaled data is written to a temporary directory unless ``--data-root`` keeps
+it between runs. 1000x writes about 3 GB of CSV and needs more memory than
+10-100x by the same factor.
+"""
+import argparse
+import json
+import os
+import platform
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+from datetime import datetime, timezone
+
+import numpy as np
+
+DASHBOARD_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+HOMEPAGE = os.path.join(DASHBOARD_DIR, "1_🤓_Homepage.py")
+
+sys.path.insert(0, DASHBOARD_DIR)
+
+
+# ------------------------------------
+# Interactions, replayed in this order. Each one prepares the page (not
+# measured) and returns the element whose .run() is timed.
+
+POLLUTANTS = ['PM10', 'SO2', 'CO', 'O3', 'NO2', 'Max']
+
+COUNTRIES = [["India"], ["Indonesia", "India"], ["China", "Pakistan", "Indonesia"], ["Indonesia"]]
+
+QUERIES = ["india", "jakarta", "19", ""]
+
+TAX_COUNTRIES = [4, 20, 60, 8]
+
+# the first run of each computes it, the rest (and the cycle's second pass) are lookups
+IMPORTANCE_METHODS = ["anova", "mutual_info", "permutation", "chi2"]
+
+ENERGY_YEARS = [(1990, 2000), (2000, 2020), (1985, 1995), (2010, 2019)]
+
+
+def _lazy_toggles(at):
+    return [toggle for toggle in at.toggle if toggle.key and toggle.key.startswith("lazy_")]
+
+
+def _rerun(at, i):
+    return at
+
+
+def _countries(at, i):
+    return at.multiselect(key="countries").set_value(COUNTRIES[i % len(COUNTRIES)])
+
+
+def _city(at, i):
+    widget = at.multiselect(key="city")
+    options = widget.options
+    return widget.set_value([options[i % len(options)], options[(i + 1) % len(options)]])
+
+
+def _explorer(at, i):
+    toggle = at.toggle(key="explore_aqi_cities")
+    if not toggle.value:
+        toggle.set_value(True).run()
+    return at.text_input(key="explore_aqi_cities_query").input(QUERIES[i % len(QUERIES)])
+
+
+def _open_analysis(at, i):
+    for toggle in _lazy_toggles(at):
+        toggle.set_value(False)
+    at.run()
+    for toggle in _lazy_toggles(at):
+        toggle.set_value(True)
+    return at
+
+
+def _x_axis(at, i):
+    return at.selectbox(key="x_axis").set_value(POLLUTANTS[i % len(POLLUTANTS)])
+
+
+def _critical_component(at, i):
+    return at.selectbox(key="critical_component").set_value(POLLUTANTS[(i + 1) % len(POLLUTANTS)])
+
+
+def _importance_method(at, i):
+    return at.selectbox(key="importance_method").set_value(IMPORTANCE_METHODS[i % len(IMPORTANCE_METHODS)])
+
+
+def _energy_range(at, i):
+    widget = at.slider(key="energy_years")
+    return widget.set_value(ENERGY_YEARS[i % len(ENERGY_YEARS)])
+
+
+def _co2_regions(at, i):
+    widget = at.multiselect(key="co2_regions")
+    return widget.set_value(widget.options[i:i + 3 * (i + 1)])
+
+
+def _tax_countries(at, i):
+    widget = at.multiselect(key="tax_countries")
+    return widget.set_value(widget.options[:TAX_COUNTRIES[i % len(TAX_COUNTRIES)]])
+
+
+# name -> (prepare/act, sections whose time counts as the ``section`` latency)
+INTERACTIONS = {
+    "rerun": (_rerun, None),
+    "countries": (_countries, None),
+    "city": (_city, ("monthly_city_aqi",)),
+    "explorer_filter": (_explorer, ("data_source",)),
+    "open_analysis": (_open_analysis, ("ispu_categories", "pollutant_distribution", "pollutant_correlation",
+                                       "pollutant_heatmap_and_features", "energy_and_emissions", "carbon_tax",
+                                       "carbon_tax_scenarios")),
+    "x_axis": (_x_axis, ("pollutant_correlation",)),
+    "critical_component": (_critical_component, ("pollutant_distribution",)),
+    "importance_method": (_importance_method, ("pollutant_heatmap_and_features",)),
+    "energy_range": (_energy_range, ("energy_and_emissions",)),
+    "co2_regions": (_co2_regions, ("energy_and_emissions",)),
+    "tax_countries": (_tax_countries, ("carbon_tax_scenarios",)),
+}
+
+
+def _percentiles(values):
+    # the first run is reported on its own when there are others
+    values = np.asarray(values[1:] if len(values) > 1 else values, dtype=np.float64)
+    return {"p50": float(np.percentile(values, 50)), "p90": float(np.percentile(values, 90)),
+            "max": float(values.max())}
+
+
+def _run(target, at):
+    target.run()
+    if at.exception:
+        raise RuntimeError(f"homepage raised: {at.exception[0].value}")
+
+
+def _timed(target, at):
+    # (seconds, profile records of this run)
+    at.session_state["_profile"] = []
+    start = time.perf_counter()
+    _run(target, at)
+    return time.perf_counter() - start, at.session_state["_profile"]
+
+
+def _traced(target, at):
+    # allocation peak of the run, counting only what it allocates
+    tracemalloc.start()
+    try:
+        _run(target, at)
+        return tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+
+def worker(repeat, memory):
+    """Runs inside the benchmark process of one scale; returns its results."""
+    import resource  # Unix only
+
+    from streamlit.testing.v1 import AppTest
+
+    os.chdir(DASHBOARD_DIR)
+    at = AppTest.from_file(HOMEPAGE, default_timeout=1800)
+    seconds, _ = _timed(at, at)
+    # ru_maxrss is in KiB on Linux
+    rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+    results = {"cold_start": {"seconds": seconds, "peak_mb": rss}, "interactions": {}}
+
+    for name, (act, sections) in INTERACTIONS.items():
+        reruns, section_times = [], []
+        for i in range(repeat):
+            seconds, records = _timed(act(at, i), at)
+            reruns.append(seconds)
+            if sections:
+                section_times.append(sum(r["seconds"] for r in records if r["section"] in sections))
+        peaks = [_traced(act(at, i), at) for i in range(repeat)] if memory else [0]
+        results["interactions"][name] = {
+            "runs": repeat,
+            "first": reruns[0],
+            "rerun": _percentiles(reruns),
+            "section": _percentiles(section_times) if section_times else None,
+            "peak_mb": max(peaks) / 2 ** 20,
+        }
+    results["rss_mb"] = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+    return results
+
+
+# ------------------------------------
+# Driver
+
+def _prepare(factor, root):
+    import data_loader
+    from synthetic import generate
+
+    directory = os.path.join(root, f"{factor}x")
+    marker = os.path.join(directory, "rows.json")
+    if os.path.exists(marker):
+        with open(marker) as f:
+            return directory, json.load(f)
+    if factor == 1:
+        rows = {}
+        for name in data_loader.DATASETS:
+            target = os.path.join(directory, data_loader.DATASETS[name][0])
+            os.makedirs(os.path.dirname(target), exist_ok=True)
+            shutil.copyfile(data_loader.dataset_path(name), target)
+            rows[name] = len(data_loader.read_csv(name))
+    else:
+        rows = generate(directory, factor)
+    with open(marker, "w") as f:
+        json.dump(rows, f)
+    return directory, rows
+
+
+def _clean(directory):
+    # caches written by the previous run, so every cold start is cold
+    for sub in ("snapshots", "aggregates", "ispu_store", "figures"):
+        shutil.rmtree(os.path.join(directory, sub), ignore_errors=True)
+
+
+def run_scale(factor, root, repeat, memory):
+    directory, rows = _prepare(factor, root)
+    _clean(directory)
+    env = dict(os.environ, DASHBOARD_DATA_DIR=directory, DASHBOARD_PROFILE="time",
+               DASHBOARD_PROFILE_LOG=os.path.join(directory, "profile.jsonl"))
+    command = [sys.executable, os.path.abspath(__file__), "--worker", "--repeat", str(repeat)]
+    if not memory:
+        command.append("--no-memory")
+    out = subprocess.run(command, env=env, capture_output=True, text=True)
+    if out.returncode:
+        raise RuntimeError(f"{factor}x failed:\n{out.stderr[-2000:]}")
+    results = json.loads(out.stdout.strip().splitlines()[-1])
+    results["rows"] = rows
+    return results
+
+
+def _report(scale, results):
+    cold = results["cold_start"]
+    print(f"\n{scale}: {sum(results['rows'].values()):,} rows, cold start {cold['seconds']:.2f}s "
+          f"({cold['peak_mb']:.0f} MB resident), {results['rss_mb']:.0f} MB resident at the end")
+    print(f"  {'interaction':20s} {'first':>8s} {'rerun p50':>10s} {'p90':>8s} {'section p50':>12s} {'p90':>8s} "
+          f"{'peak MB':>8s}")
+    for name, r in results["interactions"].items():
+        section = r["section"]
+        section = f"{section['p50'] * 1000:10.0f}ms {section['p90'] * 1000:6.0f}ms" if section else f"{'-':>12s} {'-':>8s}"
+        print(f"  {name:20s} {r['first'] * 1000:6.0f}ms {r['rerun']['p50'] * 1000:8.0f}ms "
+              f"{r['rerun']['p90'] * 1000:6.0f}ms {section} {r['peak_mb']:8.1f}")
+
+
+def compare(results, baseline, tolerance):
+    """Interactions whose median rerun is slower than ``tolerance`` times the baseline."""
+    slower = []
+    print(f"\ncompared with {baseline['meta']['time']} (rerun p50, new / old)")
+    for scale, run in results["scales"].items():
+        old = baseline["scales"].get(scale)
+        if old is None:
+            continue
+        for name, r in run["interactions"].items():
+            if name not in old["interactions"]:
+                continue
+            ratio = r["rerun"]["p50"] / old["interactions"][name]["rerun"]["p50"]
+            flag = "  SLOWER" if ratio > tolerance else ""
+            print(f"  {scale:6s} {name:20s} {ratio:5.2f}x{flag}")
+            if flag:
+                slower.append((scale, name, ratio))
+    return slower
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--scales", default="1,10,100", help="comma separated factors, 1 is the shipped data")
+    parser.add_argument("--repeat", type=int, default=5, help="runs per interaction")
+    parser.add_argument("--data-root", help="keep the generated data here instead of a temporary directory")
+    parser.add_argument("--no-memory", dest="memory", action="store_false", help="skip tracemalloc")
+    parser.add_argument("--save", help="write the results to this JSON file")
+    parser.add_argument("--compare", help="JSON file of an earlier run")
+    parser.add_argument("--tolerance", type=float, default=1.5, help="allowed slowdown for --compare")
+    parser.add_argument("--worker", action="store_true", help=argparse.SUPPRESS)
+    args = parser.parse_args(argv)
+
+    if args.worker:
+        print(json.dumps(worker(args.repeat, args.memory)))
+        return 0
+
+    import pandas as pd
+    import streamlit
+
+    results = {
+        "meta": {
+            "time": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+            "python": platform.python_version(),
+            "pandas": pd.__version__,
+            "streamlit": streamlit.__version__,
+            "cpus": os.cpu_count(),
+            "repeat": args.repeat,
+            "memory": args.memory,
+        },
+        "scales": {},
+    }
+    root = args.data_root or tempfile.mkdtemp(prefix="dashboard-bench-")
+    try:
+        for factor in (int(s) for s in args.scales.split(",")):
+            scale = f"{factor}x"
+            results["scales"][scale] = run_scale(factor, root, args.repeat, args.memory)
+            _report(scale, results["scales"][scale])
+    finally:
+        if not args.data_root:
+            shutil.rmtree(root, ignore_errors=True)
+
+    if args.save:
+        with open(args.save, "w") as f:
+            json.dump(results, f, indent=1)
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)
+        if compare(results, baseline, args.tolerance):
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,140 @@
+"""
+Cold-start benchmark for the homepage.
+
+Every sample runs in a fresh interpreter and measures, from process start:
+
+* ``imports``: time until the homepage's module-level imports are resolved
+  (streamlit, pandas, PIL and sections.py with plotly)
+* ``first_frame``: time until the first script run has produced the page
+
+and checks that the modules deferred to the sections that need them (sklearn,
+scipy, matplotlib, seaborn) were not loaded for the first frame.
+
+The samples run on a temporary copy of the data directory (DASHBOARD_DATA_DIR,
+or data/, without its generated caches), where the pre-rendered figures are
+built first (static_figures.py) so the page runs in snapshot mode; data/ itself
+is left untouched. After the first frame every static figure is served once
+more with the dataset, artifact and figure caches emptied, which must neither
+parse a dataset nor fall back to building the figure live. The run fails on
+either, or when the median of either timing exceeds its budget, so it can gate
+a deploy:
+
+    python Dashboard/benchmarks/startup.py --runs 5 --import-budget 2.5 --frame-budget 6
+"""
+import argparse
+import json
+import os
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+
+
+DASHBOARD_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+HOMEPAGE = os.path.join(DASHBOARD_DIR, "1_🤓_Homepage.py")
+
+DEFERRED_MODULES = ("sklearn", "scipy", "matplotlib", "seaborn")
+
+DATA_DIR = os.environ.get("DASHBOARD_DATA_DIR") or os.path.join(os.path.dirname(DASHBOARD_DIR), "data")
+
+# written by the dashboard, left out of the copy
+GENERATED = ("snapshots", "aggregates", "ispu_store", "figures", "profile.jsonl")
+
+# Executed in a fresh interpreter; the clock starts at interpreter start-up
+_PROBE = r"""
+import json, os, sys, time
+from time import perf_counter
+started = perf_counter() - (time.time() - float(os.environ["BENCH_T0"]))
+
+os.chdir(sys.argv[1])
+sys.path.insert(0, sys.argv[1])
+
+import streamlit, pandas, PIL.Image, sections
+imports = perf_counter() - started
+
+from streamlit.testing.v1 import AppTest
+at = AppTest.from_file(sys.argv[2], default_timeout=300).run()
+first_frame = perf_counter() - started
+loaded = [m for m in sys.argv[3].split(",") if m in sys.modules]
+
+import data_loader, static_figures
+from figure_cache import figures
+page_datasets = data_loader.cache_stats()["cached"]
+data_loader.clear_cache()
+static_figures.clear_cache()
+figures.clear()
+for name in static_figures.FIGURES:
+    static_figures.static_figure(name)
+
+print(json.dumps({
+    "imports": imports,
+    "first_frame": first_frame,
+    "exceptions": [str(e.value) for e in at.exception],
+    "loaded": loaded,
+    "page_datasets": page_datasets,
+    "static_datasets": data_loader.cache_stats()["cached"],
+    "static_live": figures.stats()["misses"],
+}))
+"""
+
+
+def sample(data_dir):
+    env = dict(os.environ, DASHBOARD_DATA_DIR=data_dir)
+    env.pop("DASHBOARD_STATIC_FIGURES", None)
+    env["BENCH_T0"] = repr(__import__("time").time())
+    out = subprocess.run(
+        [sys.executable, "-c", _PROBE, DASHBOARD_DIR, HOMEPAGE, ",".join(DEFERRED_MODULES)],
+        env=env, capture_output=True, text=True, check=True,
+    )
+    return json.loads(out.stdout.strip().splitlines()[-1])
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--runs", type=int, default=3)
+    parser.add_argument("--import-budget", type=float, default=2.5, help="seconds")
+    parser.add_argument("--frame-budget", type=float, default=6.0, help="seconds")
+    args = parser.parse_args(argv)
+
+    root = tempfile.mkdtemp(prefix="dashboard-startup-")
+    try:
+        data_dir = os.path.join(root, "data")
+        shutil.copytree(DATA_DIR, data_dir, ignore=lambda directory, names: [n for n in names if n in GENERATED])
+        subprocess.run([sys.executable, os.path.join(DASHBOARD_DIR, "static_figures.py")],
+                       env=dict(os.environ, DASHBOARD_DATA_DIR=data_dir), capture_output=True, check=True)
+        samples = [sample(data_dir) for _ in range(args.runs)]
+    finally:
+        shutil.rmtree(root, ignore_errors=True)
+    imports = statistics.median(s["imports"] for s in samples)
+    first_frame = statistics.median(s["first_frame"] for s in samples)
+    loaded = sorted({m for s in samples for m in s["loaded"]})
+    exceptions = [e for s in samples for e in s["exceptions"]]
+    static_datasets = sorted({d for s in samples for d in s["static_datasets"]})
+    static_live = max(s["static_live"] for s in samples)
+
+    print(f"imports      median {imports:.2f}s (budget {args.import_budget:.2f}s)")
+    print(f"first frame  median {first_frame:.2f}s (budget {args.frame_budget:.2f}s)")
+    print(f"datasets     {', '.join(samples[0]['page_datasets']) or 'none'} for the first frame, "
+          f"{', '.join(static_datasets) or 'none'} for the static figures")
+
+    failures = []
+    if imports > args.import_budget:
+        failures.append("import time over budget")
+    if first_frame > args.frame_budget:
+        failures.append("first frame over budget")
+    if loaded:
+        failures.append("deferred modules loaded on cold start: " + ", ".join(loaded))
+    if static_datasets:
+        failures.append("static figures loaded datasets in snapshot mode: " + ", ".join(static_datasets))
+    if static_live:
+        failures.append(f"{static_live} static figures were built live in snapshot mode")
+    if exceptions:
+        failures.append("homepage raised: " + "; ".join(exceptions))
+    for failure in failures:
+        print("FAIL", failure)
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,195 @@
+"""
+Synthetic copies of data/ scaled to N times the rows of the shipped files.
+
+Every table keeps the columns, separators and value ranges of its source, so
+the dashboard reads it through the same schemas (data_loader.DATASETS):
+
+- IQAir cities: each city is repeated as "<city> <k>" in the same country,
+  with the AQI values scaled by 10% noise and the missing months kept.
+- IQAir countries, GDP and CO2 per capita, electricity, annual CO2, BPS
+  vehicles by province: extra entities ("<name> <k>") with noisy values over
+  the same years, so joins and per-country filters grow with the data.
+- Jogja ISPU: whole rows drawn from the shipped year, on consecutive days
+  ending 12/31/2020. Daily dates stop at the pandas timestamp range, so this
+  table is capped at MAX_ISPU_DAYS (about 340x).
+- BPS vehicles per year: earlier years with noisy totals, back to 1900 at
+  most.
+
+The other files are copied unchanged. Tables are written one copy at a time,
+so generating stays cheap in memory even at 1000x.
+
+    python Dashboard/benchmarks/synthetic.py /tmp/data-100x --factor 100
+"""
+import argparse
+import os
+import shutil
+import sys
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import data_loader  # noqa: E402
+
+
+# days between 1678-01-01 and 2020-12-31, inside pd.Timestamp's range
+MAX_ISPU_DAYS = 125_000
+
+NOISE = 0.1
+
+
+def _read(name):
+    return data_loader.read_csv(name, typed=False)
+
+
+def _writer(name, directory):
+    path = os.path.join(directory, data_loader.DATASETS[name][0])
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    options = data_loader.DATASETS[name][1]
+    sep = options.get("sep", ",")
+    encoding = options.get("encoding", "utf-8")
+    f = open(path, "w", newline="", encoding=encoding)
+
+    def write(frame, header):
+        frame.to_csv(f, sep=sep, index=False, header=header, lineterminator="\n")
+    return f, write
+
+
+def _noisy(values, rng, decimals=None):
+    values = np.asarray(values, dtype=np.float64) * (1 + rng.normal(0, NOISE, np.shape(values)))
+    values = np.abs(values)
+    return values.round(decimals) if decimals is not None else values
+
+
+def _copies(name, directory, factor, rng, copy):
+    # ``copy(base, k)`` returns the k-th copy of the shipped table (k = 0 is the table itself)
+    base = _read(name)
+    rows = 0
+    f, write = _writer(name, directory)
+    with f:
+        for k in range(factor):
+            frame = base if k == 0 else copy(base, k)
+            write(frame, header=k == 0)
+            rows += len(frame)
+    return rows
+
+
+def _cities(base, k, rng):
+    out = base.copy()
+    out["city_only"] = base["city_only"] + f" {k}"
+    out["City"] = out["city_only"] + ", " + base["country"]
+    values = out.columns[2:19]
+    out[values] = _noisy(base[values], rng, 1)
+    out["Rank"] = base["Rank"] + k * len(base)
+    return out
+
+
+def _countries(base, k, rng):
+    out = base.copy()
+    out["Country/Region"] = base["Country/Region"] + f" {k}"
+    years = ["2021", "2020", "2019", "2018"]
+    out[years] = _noisy(base[years], rng, 2)
+    out["Population"] = _noisy(base["Population"], rng).astype(np.int64)
+    out["Rank"] = base["Rank"] + k * len(base)
+    return out
+
+
+def _renamed(key, value_columns, decimals=None, integer=False, code=None):
+    def copy(base, k, rng):
+        out = base.copy()
+        out[key] = base[key] + f" {k}"
+        if code is not None:
+            out[code] = base[code].where(base[code].isna(), base[code] + str(k))
+        for column in value_columns:
+            values = _noisy(base[column], rng, decimals)
+            out[column] = values.astype(np.int64) if integer else values
+        return out
+    return copy
+
+
+def _ispu(directory, factor, rng):
+    base = _read("ispu_jogja")
+    days = min(len(base) * factor, MAX_ISPU_DAYS)
+    rows = base.iloc[np.concatenate([np.arange(len(base)), rng.integers(0, len(base), days - len(base))])]
+    # the shipped year last, so the most recent readings are the real ones
+    rows = pd.concat([rows.iloc[len(base):], rows.iloc[:len(base)]], ignore_index=True)
+    dates = pd.date_range(end="2020-12-31", periods=days, freq="D")
+    rows["Date"] = [f"{d.month}/{d.day}/{d.year}" for d in dates]
+    f, write = _writer("ispu_jogja", directory)
+    with f:
+        write(rows, header=True)
+    return days
+
+
+def _vehicles(directory, factor, rng):
+    base = _read("vehicles")
+    counts = base.columns[1:]
+    earlier = []
+    for k in range(1, min(factor, (base["Year"].min() - 1900) // len(base) + 1)):
+        out = base.copy()
+        out["Year"] = base["Year"] - k * len(base)
+        out[counts[:-1]] = _noisy(base[counts[:-1]], rng).astype(np.int64)
+        out[counts[-1]] = out[counts[:-1]].sum(axis=1)
+        earlier.append(out)
+    rows = pd.concat(earlier[::-1] + [base], ignore_index=True)
+    f, write = _writer("vehicles", directory)
+    with f:
+        write(rows, header=True)
+    return len(rows)
+
+
+def _vehicles_province(base, k, rng):
+    out = base[base["Province"] != "Indonesia"].copy()
+    out["Province"] = out["Province"] + f" {k}"
+    counts = ["Mobil Penumpang", "Bus", "Truk", "Sepeda Motor"]
+    out[counts] = _noisy(out[counts], rng).astype(np.int64)
+    out["Jumlah"] = out[counts].sum(axis=1)
+    return out
+
+
+COPIES = {
+    "aqi_cities": _cities,
+    "aqi_countries": _countries,
+    "gdp": _renamed("Country Name", ["GDP"], decimals=6),
+    "co2_per_capita": _renamed("Country Name", ["Value"], decimals=6),
+    "electricity": _renamed("Entity", ["Generated_Electricity", "Fossil_Energy", "Nuclear_Energy",
+                                       "Renewable_Electricity"], decimals=6),
+    "co2_annual": _renamed("Entity", ["Annual CO2 emissions (zero filled)"], integer=True, code="Code"),
+    "vehicles_province": _vehicles_province,
+}
+
+TABLES = {"ispu_jogja": _ispu, "vehicles": _vehicles}
+
+
+def generate(directory, factor, seed=0):
+    """Write the scaled copy of data/ under ``directory``; returns {dataset: rows}."""
+    rng = np.random.default_rng(seed)
+    rows = {}
+    for name in data_loader.DATASETS:
+        if name in COPIES:
+            rows[name] = _copies(name, directory, factor, rng, lambda base, k: COPIES[name](base, k, rng))
+        elif name in TABLES:
+            rows[name] = TABLES[name](directory, factor, rng)
+        else:
+            target = os.path.join(directory, data_loader.DATASETS[name][0])
+            os.makedirs(os.path.dirname(target), exist_ok=True)
+            if not os.path.exists(target):
+                shutil.copyfile(data_loader.dataset_path(name), target)
+    return rows
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("directory")
+    parser.add_argument("--factor", type=int, default=10)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args(argv)
+
+    for name, n in generate(args.directory, args.factor, args.seed).items():
+        print(f"{name:20s} {n:>12,} rows")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,91 @@
+"""
+Carbon tax scenarios: CO2 per capita scaled onto the GDP per capita axis.
+
+A scenario is a row of (Country, Multiplier, Since). Its series are the
+country's GDP per capita and its CO2 per capita times ``Multiplier`` for the
+years after ``Since``. ``scenario_series`` computes them for any number of
+countries in one pass over rows of the GDP x CO2 panel (decoupling.py),
+without adding columns to that shared frame. A missing multiplier is picked
+per country so both series share the axis: the ratio of their means over the
+scenario's years, rounded to two significant digits.
+"""
+import numpy as np
+import pandas as pd
+
+from decoupling import decoupling_statistics
+
+
+COLUMNS = ["Country", "Multiplier", "Since"]
+
+# the four panels of the carbon tax section
+DEFAULT_SCENARIOS = pd.DataFrame(
+    [("United Kingdom", 4000, 1990), ("Sweden", 4500, 1975), ("Indonesia", 2000, 1990), ("India", 1000, 1990)],
+    columns=COLUMNS)
+
+DEFAULT_SINCE = 1990
+
+
+def scenario_table(countries):
+    """Scenarios for ``countries``: the section's defaults where known, else an automatic multiplier."""
+    table = pd.DataFrame({"Country": list(countries)})
+    table = table.merge(DEFAULT_SCENARIOS, on="Country", how="left")
+    table["Multiplier"] = table["Multiplier"].astype("float64")
+    table["Since"] = table["Since"].fillna(DEFAULT_SINCE).astype("int64")
+    return table
+
+
+def _two_digits(values):
+    values = np.asarray(values, dtype=np.float64)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        magnitude = 10.0 ** (np.floor(np.log10(values)) - 1)
+        return np.round(values / magnitude) * magnitude
+
+
+def scenario_series(joined, scenarios):
+    """Long frame of Country, Year, GDP, CO2 (scaled) and Multiplier per scenario row.
+
+    Countries come out in the order of ``scenarios`` (the last row wins for a
+    country listed twice), years in the order of ``joined``.
+    """
+    scenarios = scenarios[COLUMNS].drop_duplicates("Country", keep="last").astype({"Country": str})
+    scenarios = scenarios.fillna({"Since": DEFAULT_SINCE})
+    rows = joined.loc[joined["Country"].isin(scenarios["Country"]), ["Country", "Year", "GDP", "Co2_p"]]
+    rows = rows.astype({"Country": str}).merge(scenarios, on="Country", how="inner")
+    rows = rows[rows["Year"] > rows["Since"]]
+
+    auto = rows["Multiplier"].isna()
+    if auto.any():
+        # mean ratio over the years with emissions data, the others are zero filled
+        reported = rows[auto & (rows["Co2_p"] > 0)].groupby("Country")[["GDP", "Co2_p"]].mean()
+        picked = pd.Series(_two_digits(reported["GDP"] / reported["Co2_p"]), index=reported.index)
+        picked = picked[np.isfinite(picked) & (picked > 0)]
+        rows.loc[auto, "Multiplier"] = rows.loc[auto, "Country"].map(picked).fillna(1.0)
+
+    order = pd.Categorical(rows["Country"], categories=scenarios["Country"].tolist(), ordered=True)
+    series = pd.DataFrame({
+        "Country": order,
+        "Year": rows["Year"].to_numpy(),
+        "GDP": rows["GDP"].to_numpy(),
+        "CO2": (rows["Co2_p"] * rows["Multiplier"]).round(decimals=2).to_numpy(),
+        "Multiplier": rows["Multiplier"].to_numpy(),
+    })
+    return series.sort_values("Country", kind="stable").reset_index(drop=True)
+
+
+def scenario_summary(series):
+    """Per country: years covered, multiplier, change of both series and their decoupling statistics."""
+    grouped = series.groupby("Country", observed=True, sort=True)
+    first, last = grouped[["GDP", "CO2"]].first(), grouped[["GDP", "CO2"]].last()
+    with np.errstate(divide="ignore", invalid="ignore"):
+        change = (last / first.where(first != 0) - 1) * 100
+    stats = decoupling_statistics(series, co2="CO2").reindex(first.index)
+    return pd.DataFrame({
+        "From": grouped["Year"].min(),
+        "To": grouped["Year"].max(),
+        "Multiplier": grouped["Multiplier"].first(),
+        "GDP change %": change["GDP"].round(1),
+        "CO2 change %": change["CO2"].round(1),
+        "Correlation": stats["r"].round(3),
+        "Elasticity": stats["elasticity"].round(2),
+        "Decoupling": stats["decoupling"],
+    })
@@ -0,0 +1,166 @@
+"""
+Cleaning pipeline for the IQAir city and country tables.
+
+Regenerates the ``Clean - *.csv`` files from the raw IQAir exports with the
+steps of notebook 01, in vectorized form:
+
+* '-' is read as missing and the population column's thousands separators
+  are parsed by ``read_csv`` itself, so every column comes out typed in one
+  pass instead of a replace / apply / astype sequence;
+* gaps in the yearly and monthly AQI columns are filled with a 2-neighbour
+  KNN imputation, as in the notebook (``--imputer knn``, the default), with
+  the KD-tree version in imputation.py for large releases (``tree``), or by
+  interpolating the monthly series and KD-tree imputing the rest
+  (``interpolate``);
+* numeric columns are rounded in one call and "City, Country" is split with
+  ``str.split(expand=True)``, once per distinct city.
+
+The tables are independent and are cleaned in parallel processes. The output
+only depends on the raw files, so re-running on the same release rewrites
+identical files:
+
+    python Dashboard/cleaning.py                 # regenerate both clean files
+    python Dashboard/cleaning.py --check         # compare, write nothing
+    python Dashboard/cleaning.py cities --jobs 1 --imputer tree
+"""
+import argparse
+import functools
+import os
+import sys
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pandas as pd
+
+import data_loader
+import imputation
+
+
+CITY_VALUES = ['2021', 'JAN(2021)', 'FEB(2021)', 'MAR(2021)', 'APR(2021)', 'MAY(2021)', 'JUN(2021)',
+               'JUL(2021)', 'AUG(2021)', 'SEP(2021)', 'OCT(2021)', 'NOV(2021)', 'DEC(2021)',
+               '2020', '2019', '2018', '2017']
+
+CITY_MONTHS = CITY_VALUES[1:13]
+
+COUNTRY_VALUES = ['2021', '2020', '2019', '2018']
+
+IMPUTERS = ("knn", "tree", "interpolate")
+
+
+def read_raw(name, path=None):
+    """Raw IQAir export ``name`` (or ``path`` in its layout) with '-' as NaN and typed columns."""
+    path = path or data_loader.dataset_path(name)
+    if name == "aqi_cities_raw":
+        dtypes = {"Rank": np.int64, "City": object, **{c: np.float64 for c in CITY_VALUES}}
+        return pd.read_csv(path, na_values=["-"], keep_default_na=False, dtype=dtypes)
+    dtypes = {"Rank": np.int64, "Country/Region": object, "Population": np.int64,
+              **{c: np.float64 for c in COUNTRY_VALUES}}
+    return pd.read_csv(path, na_values=["-"], keep_default_na=False, thousands=",", dtype=dtypes)
+
+
+def impute(frame, columns, n_neighbors=2, method="knn"):
+    """Fill the gaps of ``columns`` from the ``n_neighbors`` nearest rows.
+
+    ``method`` is one of IMPUTERS: 'knn' is sklearn's KNNImputer the clean
+    files were made with, 'tree' and 'interpolate' are the scalable variants
+    in imputation.py.
+    """
+    out = frame.copy()
+    if method == "knn":
+        from sklearn.impute import KNNImputer
+
+        out[columns] = KNNImputer(n_neighbors=n_neighbors).fit_transform(frame[columns])
+        return out
+    if method == "interpolate":
+        months = [c for c in CITY_MONTHS if c in columns]
+        if months:
+            out[months] = imputation.interpolate(out[months].to_numpy())
+    elif method != "tree":
+        raise ValueError(f"Unknown imputer {method!r}, expected one of {IMPUTERS}")
+    out[columns] = imputation.knn_impute(out[columns].to_numpy(), n_neighbors=n_neighbors)
+    return out
+
+
+def _round(frame, columns, decimals=2):
+    frame[columns] = np.round(frame[columns].to_numpy(dtype=np.float64), decimals)
+
+
+def clean_cities(raw, fill=impute):
+    df = fill(raw, CITY_VALUES)
+    _round(df, CITY_VALUES)
+    # split each distinct "City, Country" once and broadcast back through the codes
+    codes, names = pd.factorize(df["City"])
+    parts = pd.Index(names).str.split(",", expand=True)
+    df["country"] = parts.get_level_values(1).str.strip().to_numpy()[codes]
+    df["city_only"] = parts.get_level_values(0).str.strip().to_numpy()[codes]
+    return df.reset_index(drop=True)
+
+
+def clean_countries(raw, fill=impute):
+    df = fill(raw, COUNTRY_VALUES)
+    _round(df, COUNTRY_VALUES)
+    return df.reset_index(drop=True)
+
+
+# table -> (raw dataset, clean dataset, cleaning step)
+TABLES = {
+    "cities": ("aqi_cities_raw", "aqi_cities", clean_cities),
+    "countries": ("aqi_countries_raw", "aqi_countries", clean_countries),
+}
+
+
+def _serialize(frame):
+    return frame.to_csv(index=False, lineterminator="\n")
+
+
+def build(table, imputer="knn"):
+    """CSV text of the clean version of ``table``."""
+    raw_name, _, clean = TABLES[table]
+    return _serialize(clean(read_raw(raw_name), fill=functools.partial(impute, method=imputer)))
+
+
+def run(tables, jobs=None, check=False, imputer="knn"):
+    """Clean ``tables`` in parallel; returns the names whose output changed."""
+    jobs = jobs or min(len(tables), os.cpu_count() or 1)
+    if jobs > 1:
+        with ProcessPoolExecutor(max_workers=jobs) as pool:
+            outputs = dict(zip(tables, pool.map(build, tables, [imputer] * len(tables))))
+    else:
+        outputs = {table: build(table, imputer) for table in tables}
+
+    changed = []
+    for table, text in outputs.items():
+        path = data_loader.dataset_path(TABLES[table][1])
+        current = None
+        if os.path.exists(path):
+            with open(path, newline="") as f:
+                current = f.read()
+        if text == current:
+            continue
+        changed.append(table)
+        if not check:
+            with open(path + ".tmp", "w", newline="") as f:
+                f.write(text)
+            os.replace(path + ".tmp", path)
+    return changed
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Regenerate the clean IQAir tables from the raw exports.")
+    parser.add_argument("tables", nargs="*", help=f"tables to clean, any of {', '.join(TABLES)} (default: all)")
+    parser.add_argument("--jobs", type=int, default=None, help="worker processes (default: one per table)")
+    parser.add_argument("--check", action="store_true", help="only report tables whose clean file differs")
+    parser.add_argument("--imputer", choices=IMPUTERS, default="knn",
+                        help="gap filling: the notebook's KNNImputer (default) or a scalable variant")
+    args = parser.parse_args()
+    tables = args.tables or list(TABLES)
+    unknown = [t for t in tables if t not in TABLES]
+    if unknown:
+        parser.error(f"unknown tables {unknown}, expected any of {list(TABLES)}")
+
+    changed = run(tables, jobs=args.jobs, check=args.check, imputer=args.imputer)
+    for table in tables:
+        status = ("differs" if args.check else "rewritten") if table in changed else "up to date"
+        print(f"{table:10s} {status}")
+    if args.check and changed:
+        sys.exit(1)
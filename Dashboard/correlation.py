@@ -0,0 +1,153 @@
+"""
+Pairwise correlation engine for the ISPU pollutant columns.
+
+All pairs are computed at once per version of the source data: Pearson and
+Spearman as a single standardized matrix product each, with two-sided p-values
+from the t distribution, and Kendall's tau-b pair by pair since it has no
+matrix form. Each method is computed the first time it is asked for, after
+which any (x, y) lookup is a dictionary access.
+
+Constant columns (e.g. the all-zero NO2 in the Jogja 2020 file) have no
+defined correlation. They are reported in ``constant`` and their rows and
+columns are NaN, without going through a division by zero.
+"""
+import threading
+
+import numpy as np
+import pandas as pd
+
+import data_loader
+from aggregates import data_version
+
+
+METHODS = ("pearson", "spearman", "kendall")
+
+
+def _standardized_product(X):
+    """Correlation matrix of the columns of X, NaN for constant columns."""
+    centered = X - X.mean(axis=0)
+    norms = np.sqrt((centered ** 2).sum(axis=0))
+    constant = norms == 0
+    norms[constant] = 1.0
+    unit = centered / norms
+    r = np.clip(unit.T @ unit, -1.0, 1.0)
+    r[constant, :] = np.nan
+    r[:, constant] = np.nan
+    return r
+
+
+def _t_test_pvalues(r, n):
+    # two-sided p-value of t = r * sqrt((n - 2) / (1 - r^2)) with n - 2 dof,
+    # written through the regularized incomplete beta to stay finite at |r| = 1
+    from scipy.special import betainc
+
+    dof = n - 2
+    p = np.full_like(r, np.nan)
+    defined = ~np.isnan(r)
+    if dof > 0:
+        r2 = r[defined] ** 2
+        p[defined] = betainc(dof / 2.0, 0.5, np.clip(1.0 - r2, 0.0, 1.0))
+    return p
+
+
+def _kendall(X, constant):
+    from scipy.stats import kendalltau
+
+    k = X.shape[1]
+    r = np.full((k, k), np.nan)
+    p = np.full((k, k), np.nan)
+    for i in range(k):
+        if constant[i]:
+            continue
+        r[i, i], p[i, i] = 1.0, 0.0
+        for j in range(i + 1, k):
+            if constant[j]:
+                continue
+            tau, pvalue = kendalltau(X[:, i], X[:, j])
+            r[i, j] = r[j, i] = tau
+            p[i, j] = p[j, i] = pvalue
+    return r, p
+
+
+class CorrelationResult:
+    def __init__(self, frame, columns, accumulator=None):
+        self.columns = list(columns)
+        self._frame = frame
+        self._accumulator = accumulator
+        if accumulator is None:
+            self.n = len(frame)
+            self._X = frame[self.columns].to_numpy(dtype=np.float64)
+            self._constant = np.ptp(self._X, axis=0) == 0 if self.n else np.ones(len(self.columns), bool)
+        else:
+            # running co-moments of the rows: Pearson needs no pass over them
+            self.n = accumulator.n
+            self._X = None
+            at = [accumulator.columns.index(c) for c in self.columns]
+            self._constant = (accumulator.maximum[at] == accumulator.minimum[at] if self.n
+                              else np.ones(len(self.columns), bool))
+        self.constant = [c for c, flag in zip(self.columns, self._constant) if flag]
+        self._position = {c: i for i, c in enumerate(self.columns)}
+        self._matrices = {}
+        self._lock = threading.Lock()
+
+    def _compute(self, method):
+        if method == "pearson" and self._accumulator is not None:
+            r = self._accumulator.correlation().loc[self.columns, self.columns].to_numpy()
+            return r, _t_test_pvalues(r, self.n)
+        if self._X is None:
+            self._X = self._frame[self.columns].to_numpy(dtype=np.float64)
+        if method == "pearson":
+            r = _standardized_product(self._X)
+            return r, _t_test_pvalues(r, self.n)
+        if method == "spearman":
+            ranks = pd.DataFrame(self._X).rank(axis=0).to_numpy()
+            r = _standardized_product(ranks)
+            return r, _t_test_pvalues(r, self.n)
+        if method == "kendall":
+            return _kendall(self._X, self._constant)
+        raise ValueError(f"Unknown method {method!r}, expected one of {METHODS}")
+
+    def _get(self, method):
+        with self._lock:
+            if method not in self._matrices:
+                self._matrices[method] = self._compute(method)
+            return self._matrices[method]
+
+    def matrix(self, method="pearson"):
+        r, _ = self._get(method)
+        return pd.DataFrame(r, index=self.columns, columns=self.columns)
+
+    def pvalues(self, method="pearson"):
+        _, p = self._get(method)
+        return pd.DataFrame(p, index=self.columns, columns=self.columns)
+
+    def pair(self, x, y, method="pearson"):
+        """(coefficient, p-value) for columns x and y; NaN when either is constant."""
+        r, p = self._get(method)
+        i, j = self._position[x], self._position[y]
+        return float(r[i, j]), float(p[i, j])
+
+
+_lock = threading.Lock()
+_results = {}  # (dataset, columns) -> (version, CorrelationResult)
+
+
+def correlations(dataset, columns, frame=None, version=None, accumulator=None):
+    """Correlation engine for ``columns`` of ``dataset`` at its current version.
+
+    ``frame`` and ``version`` stand in for a source that is not a registered
+    dataset (e.g. a station of the ISPU store); ``dataset`` then only names it.
+    With an ``accumulator`` of the same rows (ispu_ingest.IspuAccumulator) the
+    Pearson matrix comes from its co-moments; ``frame`` is then only read for
+    Spearman and Kendall.
+    """
+    key = (dataset, tuple(columns))
+    version = version or data_version(dataset)
+    with _lock:
+        cached = _results.get(key)
+        if cached is None or cached[0] != version:
+            if frame is None:
+                frame = data_loader.load_dataset(dataset)
+            cached = (version, CorrelationResult(frame, columns, accumulator))
+            _results[key] = cached
+        return cached[1]
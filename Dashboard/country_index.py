@@ -0,0 +1,73 @@
+"""
+Country-keyed index over the IQAir city and country tables.
+
+Built once per version of a table: the rows are grouped by the categorical
+code of their country with one stable argsort, and each country maps to a
+contiguous range of that ordering. Selecting one or several countries then
+costs O(rows returned) instead of a boolean scan over the whole table, and
+rows keep their original (rank) order.
+"""
+import threading
+
+import numpy as np
+import pandas as pd
+
+from data_loader import dataset_digest, load_dataset
+from instrumentation import measured
+
+
+# dataset -> column holding the country
+KEYS = {
+    "aqi_cities": "country",
+    "aqi_countries": "Country/Region",
+}
+
+
+class CountryIndex:
+    def __init__(self, frame, key):
+        self.frame = frame
+        codes, names = pd.factorize(frame[key], sort=True)
+        self.names = list(names)
+        self._codes = {name: code for code, name in enumerate(self.names)}
+        self._order = np.argsort(codes, kind="stable")
+        counts = np.bincount(codes[codes >= 0], minlength=len(self.names))
+        self._starts = np.concatenate([[0], np.cumsum(counts)]) + int((codes < 0).sum())
+
+    def counts(self):
+        """Number of rows per country."""
+        return pd.Series(np.diff(self._starts), index=self.names)
+
+    def positions(self, countries):
+        """Row positions of ``countries``, in table order."""
+        ranges = []
+        for country in countries:
+            code = self._codes.get(country)
+            if code is not None:
+                ranges.append(self._order[self._starts[code]:self._starts[code + 1]])
+        if not ranges:
+            return np.array([], dtype=np.int64)
+        if len(ranges) == 1:
+            return ranges[0]
+        return np.sort(np.concatenate(ranges))
+
+    def select(self, countries):
+        """Rows of ``countries`` (a name or a list of names) with a fresh index."""
+        if isinstance(countries, str):
+            countries = [countries]
+        return self.frame.take(self.positions(countries)).reset_index(drop=True)
+
+
+_lock = threading.Lock()
+_indexes = {}  # dataset -> (digest, CountryIndex)
+
+
+@measured("load")
+def country_index(dataset):
+    """Index of ``dataset`` (one of KEYS) at its current version."""
+    digest = dataset_digest(dataset)
+    with _lock:
+        cached = _indexes.get(dataset)
+        if cached is None or cached[0] != digest:
+            cached = (digest, CountryIndex(load_dataset(dataset), KEYS[dataset]))
+            _indexes[dataset] = cached
+        return cached[1]
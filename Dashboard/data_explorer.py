@@ -0,0 +1,94 @@
+"""
+Paginated explorer for the raw datasets in the 'Data Source' block.
+
+Nothing is loaded or serialized until the visitor opens a table with its
+toggle. After that, column projection, text filtering and sorting run on the
+server and only the rows of the visible page are sent to the browser. Each
+explorer is a fragment, so paging through one table does not rerun the page.
+"""
+import threading
+from collections import OrderedDict
+
+import numpy as np
+import pandas as pd
+import streamlit as st
+
+from data_loader import dataset_digest, load_dataset
+
+
+PAGE_SIZES = (25, 50, 100, 250)
+
+_lock = threading.Lock()
+_orders = OrderedDict()  # (dataset, digest, query, sort, ascending) -> row positions
+_MAX_ORDERS = 32
+
+
+def _row_order(name, query, sort_by, ascending):
+    """Positions of the rows matching ``query``, in display order."""
+    key = (name, dataset_digest(name), query, sort_by, ascending)
+    with _lock:
+        if key in _orders:
+            _orders.move_to_end(key)
+            return _orders[key]
+
+    frame = load_dataset(name)
+    mask = np.ones(len(frame), dtype=bool)
+    if query:
+        mask[:] = False
+        for column in frame.columns:
+            values = frame[column]
+            if values.dtype == object:
+                mask |= values.str.contains(query, case=False, regex=False, na=False).to_numpy()
+            elif isinstance(values.dtype, pd.CategoricalDtype):
+                # match each label once, then look the rows up by code
+                hits = values.cat.categories.astype(str).str.contains(query, case=False, regex=False)
+                codes = values.cat.codes.to_numpy()
+                mask |= (codes >= 0) & np.append(hits, False)[codes]
+            else:
+                mask |= values.astype(str).str.contains(query, regex=False).to_numpy()
+    positions = np.flatnonzero(mask)
+
+    if sort_by is not None:
+        keys = frame[sort_by].iloc[positions].reset_index(drop=True)
+        order = keys.sort_values(ascending=ascending, kind="stable", na_position="last").index
+        positions = positions[order.to_numpy()]
+
+    with _lock:
+        _orders[key] = positions
+        while len(_orders) > _MAX_ORDERS:
+            _orders.popitem(last=False)
+    return positions
+
+
+@st.fragment
+def _explorer(name):
+    # the toggle is inside the fragment so opening a table only runs this explorer
+    if not st.toggle('Show table', key=f"explore_{name}"):
+        return
+    frame = load_dataset(name)
+
+    col1, col2, col3, col4 = st.columns((4, 2, 1, 2))
+    columns = col1.multiselect('Columns', options=list(frame.columns), default=list(frame.columns),
+                               key=f"explore_{name}_columns")
+    sort_by = col2.selectbox('Sort by', options=[None] + list(frame.columns),
+                             key=f"explore_{name}_sort")
+    ascending = col3.toggle('Ascending', value=True, key=f"explore_{name}_ascending")
+    query = col4.text_input('Filter', key=f"explore_{name}_query").strip()
+
+    positions = _row_order(name, query, sort_by, ascending)
+
+    col1, col2, col3 = st.columns((2, 2, 4))
+    page_size = col1.selectbox('Rows per page', options=PAGE_SIZES, key=f"explore_{name}_page_size")
+    pages = max(1, -(-len(positions) // page_size))
+    page = col2.number_input('Page', min_value=1, max_value=pages, value=1, step=1,
+                             key=f"explore_{name}_page")
+    col3.caption(f"{len(positions):,} of {len(frame):,} rows, page {page} of {pages}")
+
+    visible = positions[(page - 1) * page_size: page * page_size]
+    st.dataframe(data=frame.iloc[visible][columns].reset_index(drop=True))
+
+
+def data_explorer(name, title):
+    """Expander showing dataset ``name`` one page at a time once opened."""
+    with st.expander(title):
+        _explorer(name)
@@ -0,0 +1,243 @@
+"""
+Process-wide cache for the CSV files the dashboard reads.
+
+Streamlit reruns the homepage script on every widget interaction, but imported
+modules stay alive for the whole server process, so frames parsed here are
+shared by every session and every rerun. A cached frame is only re-read when
+the source file changes on disk (mtime/size first, then content hash).
+Parsing goes through the columnar snapshots in snapshots.py when they are
+present and fresh, and falls back to the CSV otherwise.
+
+The returned frames are shared: treat them as read-only and ``.copy()`` before
+mutating anything.
+"""
+import hashlib
+import os
+import threading
+
+import pandas as pd
+
+from instrumentation import measured
+
+
+# DASHBOARD_DATA_DIR points the dashboard at another copy of data/ (e.g. the
+# scaled datasets of benchmarks/synthetic.py)
+DATA_DIR = os.path.normpath(os.environ.get("DASHBOARD_DATA_DIR") or
+                            os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir, "data"))
+
+# BPS exports are semicolon separated and start with a UTF-8 BOM
+_BPS = {"sep": ";", "encoding": "utf-8-sig"}
+
+# name -> (path relative to DATA_DIR, pd.read_csv keyword arguments)
+#
+# ``dtype`` is each table's schema: labels repeated across rows are read as
+# categoricals and integer columns at the narrowest width their values allow.
+# Float columns stay float64 because they are shown as text (bar labels, hover,
+# the data explorer), where float32 would turn 106.2 into 106.19999694824219.
+DATASETS = {
+    # Clean - AIR QUALITY INDEX (by cities).csv
+    # https://drive.google.com/uc?id=1V086i1eHdM08nk67F4l2D7_bj-ZJk8PY
+    "aqi_cities": ("Most Polluted Cities and Countries (IQAir Index)/Clean - AIR QUALITY INDEX (by cities).csv",
+                   {"dtype": {"Rank": "int32", "country": "category"}}),
+    # Clean - AIR QUALITY INDEX- top countries.csv
+    # https://drive.google.com/uc?id=11qjUGvAQiqEgfPWW8USMz6rHlARcrL_P
+    "aqi_countries": ("Most Polluted Cities and Countries (IQAir Index)/Clean - AIR QUALITY INDEX- top countries.csv",
+                      {"dtype": {"Rank": "int32"}}),
+    # Clean - pollutant-standards-index-jogja-2020.csv
+    # https://drive.google.com/uc?id=1BpMqLEYmGRuOAIyzEsx_-XXdxF5b_1vR
+    "ispu_jogja": ("Air Quality in Yogyakarta, Indonesia/Clean - pollutant-standards-index-jogja-2020.csv",
+                   {"dtype": {**dict.fromkeys(["PM10", "SO2", "CO", "O3", "NO2", "Max"], "int16"),
+                              "Critical Component": "category", "Category": "category"}}),
+    # GDPPerCapita.csv
+    # https://drive.google.com/uc?id=1rBgi4F_R9EhYerayeFvaRaRCPQV6N_IY
+    "gdp": ("Co2 Emissions and Economic/GDPPerCapita.csv",
+            {"encoding": "utf-8-sig", "dtype": {"Country Name": "category", "Year": "int16"}}),
+    # CO2EmissionsPerCapita.csv
+    # https://drive.google.com/uc?id=136cdpMhIX_WKyg5A_FKAjdDspog_Rc7p
+    "co2_per_capita": ("Co2 Emissions and Economic/CO2EmissionsPerCapita.csv",
+                       {"encoding": "utf-8-sig", "dtype": {"Country Name": "category", "Attribute": "int16"}}),
+    # ElectricityGeneratedYear.csv
+    # https://drive.google.com/uc?id=1f3LClVnVBSjExxdvsl5wSQBv3jwxF1G-
+    "electricity": ("Co2 Emissions and Economic/ElectricityGeneratedYear.csv",
+                    {"encoding": "utf-8-sig", "dtype": {"Entity": "category", "Year": "int16"}}),
+    # AnnualCOEmissionsbyRegion.csv
+    # https://drive.google.com/uc?id=1LDi87mDkdnCkl6DN_CqZw9NZprYQGUch
+    "co2_annual": ("Co2 Emissions and Economic/AnnualCOEmissionsbyRegion.csv",
+                   {"dtype": {"Entity": "category", "Code": "category", "Year": "int16"}}),
+    # jumlah_kendaraan_bermotor.csv
+    # https://drive.google.com/uc?id=1kSguqLIcFnTgqs2r67W0qLUVi0QWyHvh
+    "vehicles": ("Additinal Data/jumlah_kendaraan_bermotor.csv",
+                 dict(_BPS, dtype={"Year": "int16", **dict.fromkeys(
+                     ["Mobil Penumpang", "Mobil Bis", "Mobil Barang", "Sepeda motor", "Jumlah"], "int32")})),
+    # jumlah_kendaraan_bermotor_provinsi_jenis.csv
+    # https://drive.google.com/uc?id=1qFTbI3xHlvNMxdYDQMs34KG50n7Xrl5Y
+    "vehicles_province": ("Additinal Data/jumlah_kendaraan_bermotor_provinsi_jenis.csv",
+                          dict(_BPS, dtype={"Year": "int16", "Province": "category", **dict.fromkeys(
+                              ["Mobil Penumpang", "Bus", "Truk", "Sepeda Motor", "Jumlah"], "int32")})),
+    # jumlah_penduduk_provinsi_jk_all.csv
+    # https://drive.google.com/uc?id=1NZZlMpsApa_VSO75TQfpe4qbQs0CXQeu
+    "population": ("Additinal Data/jumlah_penduduk_provinsi_jk_all.csv", _BPS),
+
+    # Raw exports the clean files above were derived from
+    "aqi_cities_raw": ("Most Polluted Cities and Countries (IQAir Index)/AIR QUALITY INDEX (by cities) - IQAir.csv", {}),
+    "aqi_countries_raw": ("Most Polluted Cities and Countries (IQAir Index)/AIR QUALITY INDEX- top countries.csv", {}),
+    "ispu_jogja_raw": ("Air Quality in Yogyakarta, Indonesia/pollutant-standards-index-jogja-2020.csv", {}),
+    "population_male": ("Additinal Data/jumlah_penduduk_provinsi_jk_lk.csv", _BPS),
+    "population_female": ("Additinal Data/jumlah_penduduk_provinsi_jk_pr.csv", _BPS),
+}
+
+# _lock guards the dictionaries below and is never held while a file is read;
+# a dataset being parsed holds its own lock, so other datasets stay available
+_lock = threading.Lock()
+_loading = {}  # name -> threading.Lock
+_cache = {}  # name -> {"frame", "stat", "digest"}
+_digests = {}  # name -> (stat, digest), also for files that are never parsed
+_stats = {"hits": 0, "misses": 0, "reloads": 0}
+_raw_sizes = {}  # (name, digest) -> (dtypes, bytes per column) without the schema
+
+
+def dataset_path(name):
+    return os.path.normpath(os.path.join(DATA_DIR, DATASETS[name][0]))
+
+
+def _file_digest(path):
+    h = hashlib.sha1()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1 << 20), b""):
+            h.update(block)
+    return h.hexdigest()
+
+
+def _stat(path):
+    st_ = os.stat(path)
+    return st_.st_mtime_ns, st_.st_size
+
+
+def _digest(name, path, stat):
+    # content hash of ``path``, only re-hashed when mtime/size changed
+    with _lock:
+        known = _digests.get(name)
+    if known is not None and known[0] == stat:
+        return known[1]
+    digest = _file_digest(path)
+    with _lock:
+        _digests[name] = (stat, digest)
+    return digest
+
+
+def read_csv(name, typed=True):
+    """Parse the source CSV of ``name``, bypassing the cache and snapshots.
+
+    ``typed=False`` ignores the dataset's schema and lets pandas infer dtypes.
+    """
+    options = DATASETS[name][1]
+    if not typed:
+        options = {key: value for key, value in options.items() if key != "dtype"}
+    return pd.read_csv(dataset_path(name), **options)
+
+
+def _read(name, digest):
+    # imported here because snapshots builds on this module
+    import snapshots
+
+    frame = snapshots.read_snapshot(name, digest)
+    if frame is None:
+        frame = read_csv(name)
+        snapshots.write_snapshot(name, frame, digest)
+    return frame
+
+
+@measured("load")
+def load_dataset(name):
+    """Return the parsed frame for ``name``, reading the file only when it changed."""
+    if name not in DATASETS:
+        raise KeyError(f"Unknown dataset {name!r}, expected one of {sorted(DATASETS)}")
+
+    path = dataset_path(name)
+    stat = _stat(path)
+
+    with _lock:
+        entry = _cache.get(name)
+        if entry is not None and entry["stat"] == stat:
+            _stats["hits"] += 1
+            return entry["frame"]
+        loading = _loading.setdefault(name, threading.Lock())
+
+    with loading:
+        with _lock:
+            # loaded by another session while this one waited
+            entry = _cache.get(name)
+            if entry is not None and entry["stat"] == stat:
+                _stats["hits"] += 1
+                return entry["frame"]
+
+        # mtime/size changed (or first load): only re-parse when the content did
+        digest = _digest(name, path, stat)
+        if entry is not None and entry["digest"] == digest:
+            with _lock:
+                entry["stat"] = stat
+                _stats["hits"] += 1
+            return entry["frame"]
+
+        frame = _read(name, digest)
+        with _lock:
+            _stats["misses"] += 1
+            if entry is not None:
+                _stats["reloads"] += 1
+            _cache[name] = {"frame": frame, "stat": stat, "digest": digest}
+        return frame
+
+
+def dataset_digest(name):
+    """Content hash of the file of ``name``, without parsing it.
+
+    Versions computed from it (aggregates.data_version) therefore never
+    materialize the dataset, e.g. for the views streamed from the CSV.
+    """
+    if name not in DATASETS:
+        raise KeyError(f"Unknown dataset {name!r}, expected one of {sorted(DATASETS)}")
+    path = dataset_path(name)
+    return _digest(name, path, _stat(path))
+
+
+def cache_stats():
+    with _lock:
+        return dict(_stats, cached=sorted(_cache))
+
+
+def _column_bytes(frame):
+    return frame.memory_usage(index=False, deep=True)
+
+
+def memory_report(names=None):
+    """Bytes per column of the cached frames (or of ``names``), with and without their schema.
+
+    One row per column: its inferred (``raw_*``) and schema dtype and size.
+    The inferred sizes come from parsing the CSV again, once per version.
+    """
+    if names is None:
+        with _lock:
+            names = sorted(_cache)
+    rows = []
+    for name in names:
+        frame = load_dataset(name)
+        key = (name, dataset_digest(name))
+        with _lock:
+            raw = _raw_sizes.get(key)
+        if raw is None:
+            untyped = read_csv(name, typed=False)
+            raw = (untyped.dtypes.astype(str), _column_bytes(untyped))
+            with _lock:
+                _raw_sizes[key] = raw
+        for column, size in _column_bytes(frame).items():
+            rows.append((name, column, raw[0][column], int(raw[1][column]), str(frame[column].dtype), int(size)))
+    return pd.DataFrame(rows, columns=["dataset", "column", "raw_dtype", "raw_bytes", "dtype", "bytes"])
+
+
+def clear_cache():
+    with _lock:
+        _cache.clear()
+        _digests.clear()
+        _raw_sizes.clear()
+        for key in _stats:
+            _stats[key] = 0
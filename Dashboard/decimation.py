@@ -0,0 +1,150 @@
+"""
+Point decimation for line and scatter figures.
+
+``decimate(fig)`` caps the number of points each scatter/line trace sends to
+the browser, with either Largest-Triangle-Three-Buckets (keeps the visual
+shape of a line) or min/max bucketing (keeps every local extreme), and turns
+traces that are still large into WebGL (``scattergl``) traces. Array-valued
+trace properties (text, hover text, custom data, per-point marker styles) are
+reduced along with x and y.
+
+The original and reduced point counts are recorded in the figure's
+``layout.meta`` so they survive the figure cache; ``decimation_note(fig)``
+turns them into a caption. Defaults come from DASHBOARD_MAX_POINTS (2000
+points per trace) and DASHBOARD_WEBGL_POINTS (1000).
+"""
+import os
+
+import numpy as np
+import pandas as pd
+import plotly.graph_objects as go
+
+from instrumentation import measured
+
+
+MAX_POINTS = int(os.environ.get("DASHBOARD_MAX_POINTS", 2000))
+WEBGL_POINTS = int(os.environ.get("DASHBOARD_WEBGL_POINTS", 1000))
+
+METHODS = ("lttb", "minmax")
+
+# per-point properties that have to follow the kept indices
+_POINT_PROPERTIES = ("x", "y", "text", "hovertext", "customdata", "ids")
+_MARKER_PROPERTIES = ("color", "size", "symbol", "opacity")
+
+
+def _numeric(values):
+    values = pd.Series(values)
+    if pd.api.types.is_datetime64_any_dtype(values):
+        return values.astype("int64").to_numpy(dtype=np.float64)
+    numeric = pd.to_numeric(values, errors="coerce")
+    if numeric.isna().any() and not values.isna().any():
+        # categorical axis (e.g. month names), buckets follow the point order
+        return np.arange(len(values), dtype=np.float64)
+    return numeric.to_numpy(dtype=np.float64)
+
+
+def lttb(x, y, n_out):
+    """Indices of the ``n_out`` points Largest-Triangle-Three-Buckets keeps."""
+    n = len(x)
+    if n_out >= n or n_out < 3:
+        return np.arange(n)
+    edges = np.linspace(1, n - 1, n_out - 1).astype(np.int64)
+    kept = np.empty(n_out, dtype=np.int64)
+    kept[0], kept[-1] = 0, n - 1
+    previous = 0
+    for i in range(n_out - 2):
+        start, stop = edges[i], edges[i + 1]
+        # the next bucket's centroid stands in for the point not chosen yet
+        following = slice(stop, edges[i + 2] if i + 2 < len(edges) else n)
+        cx, cy = x[following].mean(), y[following].mean()
+        ax, ay = x[previous], y[previous]
+        bx, by = x[start:stop], y[start:stop]
+        area = np.abs((ax - cx) * (by - ay) - (ax - bx) * (cy - ay))
+        previous = start + int(np.nanargmax(area)) if np.isfinite(area).any() else start
+        kept[i + 1] = previous
+    return kept
+
+
+def minmax(x, y, n_out):
+    """Indices of the minimum and maximum of ``n_out // 2`` equal-count buckets."""
+    n = len(x)
+    if n_out >= n or n_out < 4:
+        return np.arange(n)
+    buckets = n_out // 2
+    edges = np.linspace(0, n, buckets + 1).astype(np.int64)
+    filled = np.where(np.isnan(y), np.inf, y)
+    lows = np.minimum.reduceat(filled, edges[:-1])
+    highs = np.maximum.reduceat(np.where(np.isnan(y), -np.inf, y), edges[:-1])
+    kept = []
+    for start, stop, low, high in zip(edges[:-1], edges[1:], lows, highs):
+        segment = y[start:stop]
+        kept.append(start + int(np.argmax(segment == low)) if np.isfinite(low) else start)
+        kept.append(start + int(np.argmax(segment == high)) if np.isfinite(high) else stop - 1)
+    return np.unique(kept)
+
+
+def _reduce(trace, keep):
+    n = len(trace.x)
+    for name in _POINT_PROPERTIES:
+        values = trace[name]
+        if values is not None and not isinstance(values, str) and len(values) == n:
+            trace[name] = np.asarray(values)[keep]
+    marker = trace.marker
+    for name in _MARKER_PROPERTIES:
+        values = marker[name] if marker is not None else None
+        if values is not None and np.ndim(values) == 1 and len(values) == n:
+            marker[name] = np.asarray(values)[keep]
+
+
+def _to_webgl(trace):
+    spec = trace.to_plotly_json()
+    spec.pop("type", None)
+    return go.Scattergl(spec, skip_invalid=True)
+
+
+@measured("figure")
+def decimate(fig, max_points=MAX_POINTS, method="lttb", webgl=WEBGL_POINTS):
+    """Cap every scatter trace of ``fig`` at ``max_points`` points, in place.
+
+    ``method`` is 'lttb' or 'minmax'; ``max_points=None`` only switches large
+    traces to WebGL and ``webgl=None`` never does. Returns ``fig``.
+    """
+    if method not in METHODS:
+        raise ValueError(f"Unknown method {method!r}, expected one of {METHODS}")
+    original = reduced = 0
+    traces = []
+    for trace in fig.data:
+        if trace.type not in ("scatter", "scattergl") or trace.x is None or trace.y is None:
+            traces.append(trace)
+            continue
+        n = len(trace.x)
+        if max_points is not None and n > max_points:
+            x, y = _numeric(trace.x), _numeric(trace.y)
+            order = None
+            if "lines" not in (trace.mode or "lines") and np.any(np.diff(x) < 0):
+                # a marker cloud has no point order, bucket it along x
+                order = np.argsort(x, kind="stable")
+                x, y = x[order], y[order]
+            keep = (lttb if method == "lttb" else minmax)(x, y, max_points)
+            _reduce(trace, keep if order is None else np.sort(order[keep]))
+        original += n
+        reduced += len(trace.x)
+        if webgl is not None and trace.type == "scatter" and len(trace.x) > webgl:
+            trace = _to_webgl(trace)
+        traces.append(trace)
+    fig.data = ()
+    fig.add_traces(traces)
+    meta = dict(fig.layout.meta) if isinstance(fig.layout.meta, dict) else {}
+    meta["decimation"] = {"original": original, "reduced": reduced, "method": method}
+    fig.update_layout(meta=meta)
+    return fig
+
+
+def decimation_note(fig):
+    """Caption with the point counts when ``decimate`` dropped points, else None."""
+    meta = fig.layout.meta
+    counts = meta.get("decimation") if isinstance(meta, dict) else None
+    if not counts or counts["reduced"] >= counts["original"]:
+        return None
+    return (f"Showing {counts['reduced']:,} of {counts['original']:,} points "
+            f"({counts['method']} decimation)")
@@ -0,0 +1,142 @@
+"""
+GDP x CO2 per capita panel and per-country decoupling statistics.
+
+The panel is the ``gdp_co2`` view (aggregates.py) sorted by (Country, Year)
+once per version of its source data, so each country is a contiguous range
+and selecting countries costs O(rows returned). For every country at once it
+computes, in one grouped pass of ``np.bincount`` sums:
+
+- ``r``: Pearson correlation of GDP and CO2 per capita,
+- ``elasticity``: slope of log CO2 on log GDP per capita (% change of
+  emissions per 1% of GDP),
+- ``gdp_growth``, ``co2_growth``: log-linear yearly trends, in % per year,
+- ``intensity_trend``: yearly trend of CO2 per unit of GDP, in % per year,
+- ``decoupling``: "absolute" when GDP grows while emissions fall, "relative"
+  when emissions grow slower than GDP, else "none".
+
+Years with a zero GDP or CO2 value are missing in the source files and left
+out. Countries with fewer than three such years get NaN.
+"""
+import threading
+
+import numpy as np
+import pandas as pd
+
+from aggregates import get_view, view_version
+from instrumentation import measured
+
+
+MIN_YEARS = 3
+
+
+def _grouped(codes, k, x, y):
+    # (slope of y on x, Pearson r) per group, from centered sums
+    n = np.bincount(codes, minlength=k).astype(np.float64)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        dx = x - (np.bincount(codes, x, k) / n)[codes]
+        dy = y - (np.bincount(codes, y, k) / n)[codes]
+        sxx = np.bincount(codes, dx * dx, k)
+        syy = np.bincount(codes, dy * dy, k)
+        sxy = np.bincount(codes, dx * dy, k)
+        return sxy / sxx, np.clip(sxy / np.sqrt(sxx * syy), -1.0, 1.0)
+
+
+def _statistics(codes, names, years, gdp, co2):
+    k = len(names)
+    valid = (codes >= 0) & (gdp > 0) & (co2 > 0)
+    codes, years, gdp, co2 = codes[valid], years[valid].astype(np.float64), gdp[valid], co2[valid]
+    n = np.bincount(codes, minlength=k)
+
+    r = _grouped(codes, k, gdp, co2)[1]
+    log_gdp, log_co2 = np.log(gdp), np.log(co2)
+    elasticity = _grouped(codes, k, log_gdp, log_co2)[0]
+    gdp_trend = _grouped(codes, k, years, log_gdp)[0]
+    co2_trend = _grouped(codes, k, years, log_co2)[0]
+
+    first = np.full(k, np.nan)
+    last = np.full(k, np.nan)
+    np.fmin.at(first, codes, years)
+    np.fmax.at(last, codes, years)
+
+    stats = pd.DataFrame({
+        "years": n,
+        "from": first,
+        "to": last,
+        "r": r,
+        "elasticity": elasticity,
+        "gdp_growth": np.expm1(gdp_trend) * 100,
+        "co2_growth": np.expm1(co2_trend) * 100,
+        "intensity_trend": np.expm1(co2_trend - gdp_trend) * 100,
+    }, index=pd.Index(names, name="Country"))
+    stats.loc[stats["years"] < MIN_YEARS, "r":] = np.nan
+    stats["decoupling"] = np.select(
+        [(stats["gdp_growth"] > 0) & (stats["co2_growth"] < 0), stats["intensity_trend"] < 0],
+        ["absolute", "relative"], "none")
+    stats.loc[stats["r"].isna(), "decoupling"] = None
+    return stats.astype({"from": "Int64", "to": "Int64"})
+
+
+def decoupling_statistics(frame, gdp="GDP", co2="Co2_p"):
+    """Statistics per Country of ``frame`` (Country, Year, GDP and CO2 per capita columns).
+
+    CO2 may be scaled by a constant per country (as in carbon_tax.py); none of
+    the statistics depend on it.
+    """
+    codes, names = pd.factorize(frame["Country"], sort=True)
+    return _statistics(codes, list(names), frame["Year"].to_numpy(),
+                       frame[gdp].to_numpy(np.float64), frame[co2].to_numpy(np.float64))
+
+
+def correlation_label(r):
+    """``r`` with its strength and direction, e.g. "-0.889 (Strong Negative Correlation)"."""
+    if pd.isna(r):
+        return "n/a"
+    strength = "Strong" if abs(r) >= 0.7 else "Moderate" if abs(r) >= 0.4 else "Weak"
+    return f"{r:.3f} ({strength} {'Positive' if r >= 0 else 'Negative'} Correlation)"
+
+
+class GdpCo2Panel:
+    def __init__(self, joined):
+        codes, names = pd.factorize(joined["Country"], sort=True)
+        order = np.lexsort((joined["Year"].to_numpy(), codes))
+        self.names = list(names)
+        self.frame = joined.take(order).set_index(["Country", "Year"])
+        self._codes = codes[order]
+        self._positions = {name: code for code, name in enumerate(self.names)}
+        counts = np.bincount(codes[codes >= 0], minlength=len(self.names))
+        self._starts = np.concatenate([[0], np.cumsum(counts)]) + int((codes < 0).sum())
+        self._statistics = {}
+        self._lock = threading.Lock()
+
+    def select(self, countries):
+        """Rows of ``countries`` as a flat frame, by country then year."""
+        ranges = [np.arange(self._starts[code], self._starts[code + 1])
+                  for code in (self._positions.get(country) for country in countries) if code is not None]
+        positions = np.concatenate(ranges) if ranges else np.array([], dtype=np.int64)
+        return self.frame.iloc[positions].reset_index()
+
+    def statistics(self, since=None):
+        """Statistics of every country over the years after ``since`` (all years by default)."""
+        with self._lock:
+            if since not in self._statistics:
+                years = self.frame.index.get_level_values("Year").to_numpy()
+                codes = self._codes if since is None else np.where(years > since, self._codes, -1)
+                self._statistics[since] = _statistics(codes, self.names, years,
+                                                      self.frame["GDP"].to_numpy(np.float64),
+                                                      self.frame["Co2_p"].to_numpy(np.float64))
+            return self._statistics[since]
+
+
+_lock = threading.Lock()
+_panel = None  # (version, GdpCo2Panel)
+
+
+@measured("load")
+def gdp_co2_panel():
+    """The panel at the current version of the GDP and CO2 per capita datasets."""
+    global _panel
+    version = view_version("gdp_co2")
+    with _lock:
+        if _panel is None or _panel[0] != version:
+            _panel = (version, GdpCo2Panel(get_view("gdp_co2")))
+        return _panel[1]
@@ -0,0 +1,77 @@
+"""
+Diagnostics panel for the sidebar.
+
+Shows what the process-wide caches hold: the memory taken by each loaded
+dataset with its schema (data_loader.DATASETS) against the dtypes pandas would
+infer, and the hit rates of the dataset and figure caches. Nothing is computed
+until the panel is switched on. While profiling is on (see instrumentation.py)
+it also summarizes this session's section timings.
+"""
+import pandas as pd
+import streamlit as st
+
+import data_loader
+import instrumentation
+from figure_cache import figures
+
+
+def _mb(n):
+    return f"{n / 2 ** 20:,.2f} MB"
+
+
+@st.fragment
+def _memory():
+    if not st.toggle('Memory report', key="diagnostics_memory"):
+        return
+    report = data_loader.memory_report()
+    if report.empty:
+        st.caption("No dataset loaded yet.")
+        return
+
+    totals = report.groupby("dataset", sort=True)[["raw_bytes", "bytes"]].sum()
+    raw, typed = int(totals["raw_bytes"].sum()), int(totals["bytes"].sum())
+    st.metric("Loaded datasets", _mb(typed), delta=f"-{_mb(raw - typed)} vs inferred dtypes", delta_color="off")
+    totals["saved"] = (1 - totals["bytes"] / totals["raw_bytes"]).map("{:.0%}".format)
+    st.dataframe(totals)
+
+    name = st.selectbox('Columns of', options=list(totals.index), key="diagnostics_dataset")
+    st.dataframe(report[report["dataset"] == name].drop(columns="dataset").set_index("column"))
+
+
+def profile_summary(records):
+    """Mean milliseconds per phase and section over ``records``, slowest section first."""
+    rows = []
+    for record in records:
+        row = {"section": record["section"], "total": record["seconds"] * 1000,
+               "chart KB": record["chart_bytes"] / 1024}
+        for name in instrumentation.PHASES:
+            row[name] = record["phases"].get(name, {}).get("seconds", 0.0) * 1000
+        if "peak_bytes" in record:
+            row["peak MB"] = record["peak_bytes"] / 2 ** 20
+        rows.append(row)
+    frame = pd.DataFrame(rows)
+    summary = frame.groupby("section").mean()
+    summary.insert(0, "runs", frame.groupby("section").size())
+    return summary.sort_values("total", ascending=False).round(1)
+
+
+def _profile():
+    records = instrumentation.history()
+    st.caption(f"Profiling ({instrumentation.mode()}): {len(records)} section runs this session, "
+               f"logged to {instrumentation.LOG_PATH}")
+    if records:
+        st.dataframe(profile_summary(records))
+
+
+def diagnostics_panel():
+    """Sidebar expander with the memory report, cache statistics and section profile."""
+    with st.expander('Diagnostics', expanded=instrumentation.mode() is not None):
+        if instrumentation.mode() is not None:
+            _profile()
+        _memory()
+        loader = data_loader.cache_stats()
+        figure = figures.stats()
+        st.caption(f"Datasets: {len(loader['cached'])} cached, {loader['hits']} hits, "
+                   f"{loader['misses']} misses, {loader['reloads']} reloads")
+        st.caption(f"Figures: {figure['size']}/{figure['maxsize']} cached ({_mb(figure['bytes'])}), "
+                   f"{figure['hits']} hits, {figure['misses']} misses")
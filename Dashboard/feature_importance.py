@@ -0,0 +1,193 @@
+"""
+Feature importance of the ISPU pollutant columns for the air quality category.
+
+Each method is computed the first time it is asked for, per version of the
+source data, after which lookups are dictionary accesses (like
+correlation.py):
+
+- ``chi2`` and ``anova``: the chi-squared and ANOVA F statistics of
+  sklearn's ``chi2``/``f_classif``, from per-class sums,
+- ``mutual_info``: mutual information with the category (k-NN estimate),
+- ``permutation``: drop in accuracy of a random forest on held-out days when
+  the column is shuffled.
+
+Every score comes with a confidence interval. The univariate scores are
+refitted on DASHBOARD_IMPORTANCE_BOOTSTRAP resamples of the rows (default
+100); the permutation importance uses the spread of PERMUTATION_REPEATS
+shuffles. The expensive methods (EXPENSIVE) run their resamples or shuffles
+in DASHBOARD_IMPORTANCE_JOBS joblib worker processes (default: one per CPU).
+
+Rows with a missing feature or target are left out. Constant columns (the
+all-zero NO2 of the Jogja 2020 file) have no chi-squared or F statistic and
+get NaN.
+"""
+import os
+import threading
+import warnings
+
+import numpy as np
+import pandas as pd
+
+from aggregates import data_version
+
+
+METHODS = ("chi2", "anova", "mutual_info", "permutation")
+
+LABELS = {
+    "chi2": "Chi-squared",
+    "anova": "ANOVA F",
+    "mutual_info": "Mutual information",
+    "permutation": "Permutation importance",
+}
+
+EXPENSIVE = {"mutual_info", "permutation"}
+
+BOOTSTRAP = int(os.environ.get("DASHBOARD_IMPORTANCE_BOOTSTRAP", 100))
+PERMUTATION_REPEATS = 30
+JOBS = int(os.environ.get("DASHBOARD_IMPORTANCE_JOBS", -1))
+CONFIDENCE = 0.95
+
+
+def _class_statistic(method, X, onehot, weights):
+    # chi-squared or ANOVA F of every column with rows counted ``weights`` times,
+    # from per-class weighted sums (as sklearn's chi2 and f_classif)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        counts = weights @ onehot
+        sums = onehot.T @ (weights[:, None] * X)
+        total = sums.sum(axis=0)
+        present = counts > 0
+        if method == "chi2":
+            expected = np.outer(counts / counts.sum(), total)
+            terms = np.where(present[:, None], (sums - expected) ** 2 / expected, 0.0)
+            return np.where(total > 0, terms.sum(axis=0), np.nan)
+        n, k = counts.sum(), present.sum()
+        between = (sums[present] ** 2 / counts[present, None]).sum(axis=0) - total ** 2 / n
+        within = weights @ (X ** 2) - total ** 2 / n - between
+        return (between / (k - 1)) / (within / (n - k))
+
+
+def _univariate(method, X, y, seed=0):
+    if method != "mutual_info":
+        onehot = (y[:, None] == np.unique(y)).astype(np.float64)
+        return _class_statistic(method, X, onehot, np.ones(len(y)))
+
+    from sklearn.feature_selection import mutual_info_classif
+
+    return mutual_info_classif(X, y, random_state=seed)
+
+
+def _resampled(method, X, y, seeds):
+    # one row of scores per bootstrap resample, drawn with each of ``seeds``
+    onehot = (y[:, None] == np.unique(y)).astype(np.float64)
+    scores = np.empty((len(seeds), X.shape[1]))
+    for row, seed in enumerate(seeds):
+        rows = np.random.default_rng(seed).integers(0, len(y), len(y))
+        if method == "mutual_info":
+            scores[row] = _univariate(method, X[rows], y[rows], seed)
+        else:
+            # a resample is the table with each row counted as often as it was drawn
+            scores[row] = _class_statistic(method, X, onehot, np.bincount(rows, minlength=len(y)).astype(np.float64))
+    return scores
+
+
+def _workers():
+    from joblib import effective_n_jobs
+
+    return effective_n_jobs(JOBS)
+
+
+def _bootstrap(method, X, y):
+    seeds = np.arange(BOOTSTRAP)
+    workers = _workers() if method in EXPENSIVE else 1
+    if workers == 1 or BOOTSTRAP < 2:
+        return _resampled(method, X, y, seeds)
+
+    from joblib import Parallel, delayed
+
+    chunks = np.array_split(seeds, min(workers, BOOTSTRAP))
+    return np.vstack(Parallel(n_jobs=len(chunks))(delayed(_resampled)(method, X, y, chunk) for chunk in chunks))
+
+
+def _permutation(X, y, seed=0):
+    # (shuffles, features) accuracy drops on a held-out 30% of the rows
+    from sklearn.ensemble import RandomForestClassifier
+    from sklearn.inspection import permutation_importance
+    from sklearn.model_selection import train_test_split
+
+    _, counts = np.unique(y, return_counts=True)
+    stratify = y if counts.min() >= 2 else None
+    X_train, X_test, y_train, y_test = train_test_split(X, y, test_size=0.3, random_state=seed, stratify=stratify)
+    model = RandomForestClassifier(n_estimators=100, random_state=seed).fit(X_train, y_train)
+    result = permutation_importance(model, X_test, y_test, n_repeats=PERMUTATION_REPEATS,
+                                    random_state=seed, n_jobs=_workers())
+    return result.importances.T
+
+
+class FeatureImportance:
+    def __init__(self, frame, features, target):
+        data = frame[list(features) + [target]].dropna()
+        self.features = list(features)
+        self.target = target
+        self.n = len(data)
+        self._X = data[self.features].to_numpy(dtype=np.float64)
+        self._y = data[target].astype(str).to_numpy()
+        self._results = {}
+        self._lock = threading.Lock()
+
+    def _compute(self, method):
+        if method == "permutation":
+            samples = _permutation(self._X, self._y)
+            return samples.mean(axis=0), samples
+        if method in METHODS:
+            return _univariate(method, self._X, self._y), _bootstrap(method, self._X, self._y)
+        raise ValueError(f"Unknown method {method!r}, expected one of {METHODS}")
+
+    def _get(self, method):
+        with self._lock:
+            if method not in self._results:
+                self._results[method] = self._compute(method)
+            return self._results[method]
+
+    def computed(self, method):
+        """Whether ``method`` is already cached, i.e. ``scores`` returns at once."""
+        with self._lock:
+            return method in self._results
+
+    def scores(self, method="chi2"):
+        """Frame of feature, score and its confidence interval (ci_low, ci_high), highest score first."""
+        score, samples = self._get(method)
+        tail = (1 - CONFIDENCE) / 2 * 100
+        with warnings.catch_warnings():
+            # all-NaN columns (constant features) have no interval
+            warnings.simplefilter("ignore", RuntimeWarning)
+            low, high = np.nanpercentile(samples, [tail, 100 - tail], axis=0)
+        return pd.DataFrame({
+            "feature": self.features,
+            "score": score,
+            "ci_low": low,
+            "ci_high": high,
+        }).sort_values("score", ascending=False).reset_index(drop=True)
+
+
+_lock = threading.Lock()
+_results = {}  # (dataset, features, target) -> (version, FeatureImportance)
+
+
+def feature_importance(dataset, features, target, frame=None, version=None):
+    """Importance engine of ``features`` for ``target`` in ``dataset`` at its current version.
+
+    ``frame`` and ``version`` stand in for a source that is not a registered
+    dataset (e.g. a station of the ISPU store); ``dataset`` then only names it.
+    """
+    key = (dataset, tuple(features), target)
+    version = version or data_version(dataset)
+    with _lock:
+        cached = _results.get(key)
+        if cached is None or cached[0] != version:
+            if frame is None:
+                import data_loader
+
+                frame = data_loader.load_dataset(dataset)
+            cached = (version, FeatureImportance(frame, features, target))
+            _results[key] = cached
+        return cached[1]
@@ -0,0 +1,73 @@
+"""
+Process-wide LRU cache of plotly figures that depend on widget state.
+
+Figures are keyed by the version of the data they are drawn from (see
+aggregates.data_version) plus the widget values that shaped them, and are
+stored as serialized figure JSON so cached entries are immutable and cheap to
+hold. The size bound comes from DASHBOARD_FIGURE_CACHE_SIZE (default 64).
+"""
+import os
+import threading
+from collections import OrderedDict
+
+import plotly.io as pio
+
+from aggregates import data_version
+from instrumentation import measured
+
+
+class FigureCache:
+    def __init__(self, maxsize=64):
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get_or_build(self, key, build):
+        """Return the figure stored under ``key``, calling ``build()`` on a miss."""
+        with self._lock:
+            payload = self._entries.get(key)
+            if payload is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+        if payload is None:
+            # build outside the lock, figures for other keys can be served meanwhile
+            payload = build().to_json()
+            with self._lock:
+                self.misses += 1
+                self._entries[key] = payload
+                self._entries.move_to_end(key)
+                while len(self._entries) > self.maxsize:
+                    self._entries.popitem(last=False)
+        return pio.from_json(payload)
+
+    def stats(self):
+        with self._lock:
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "size": len(self._entries),
+                "maxsize": self.maxsize,
+                "bytes": sum(len(p) for p in self._entries.values()),
+            }
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self.hits = 0
+            self.misses = 0
+
+
+figures = FigureCache(maxsize=int(os.environ.get("DASHBOARD_FIGURE_CACHE_SIZE", 64)))
+
+
+@measured("figure")
+def cached_figure(name, inputs, params, build, version=None):
+    """Figure ``name`` drawn from datasets ``inputs`` for widget values ``params``.
+
+    ``version`` overrides the data version for figures drawn from a source
+    that is not a registered dataset (e.g. the ISPU store).
+    """
+    key = (name, version or data_version(*inputs), tuple(params))
+    return figures.get_or_build(key, build)
@@ -0,0 +1,82 @@
+"""
+Number formatting shared by the dashboard sections.
+"""
+import numpy as np
+import pandas as pd
+
+
+SUFFIXES = np.array(['', 'K', 'M', 'B', 'T', 'P'])
+
+
+def _magnitudes(values):
+    # thousands exponent from log10, then fixed up at the bucket edges where
+    # log10 rounding can land one bucket off
+    absolute = np.abs(values)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        magnitude = np.floor(np.log10(absolute) / 3)
+    magnitude = np.nan_to_num(magnitude, nan=0.0, neginf=0.0, posinf=len(SUFFIXES) - 1)
+    magnitude = np.clip(magnitude, 0, len(SUFFIXES) - 1).astype(np.int64)
+
+    scale = 1000.0 ** magnitude
+    magnitude += (absolute / scale >= 1000) & (magnitude < len(SUFFIXES) - 1)
+    magnitude -= (absolute / scale < 1) & (magnitude > 0)
+    return magnitude
+
+
+# Scaled values stay below 1000, so every label is one of 10001 tenths per
+# (sign, suffix) pair. Those slabs are built on first use and the formatting of
+# a whole array becomes a single gather.
+_MAX_TENTHS = 10000
+_slabs = {}
+
+
+def _slab(negative, magnitude):
+    key = (negative, magnitude)
+    if key not in _slabs:
+        sign = "-" if negative else ""
+        suffix = SUFFIXES[magnitude]
+        _slabs[key] = np.array(
+            [f"{sign}{k // 10}.{k % 10}{suffix}" for k in range(_MAX_TENTHS + 1)], dtype=object)
+    return _slabs[key]
+
+
+def _labels(scaled, magnitude):
+    tenths = np.abs(scaled) * 10
+    finite = np.isfinite(tenths) & (tenths <= _MAX_TENTHS)
+    tenths[~finite] = 0
+    rounded = np.rint(tenths).astype(np.int64)
+    negative = np.signbit(scaled)
+
+    slab_ids = negative * len(SUFFIXES) + magnitude
+    labels = np.empty(len(scaled), dtype=object)
+    for slab_id in np.unique(slab_ids):
+        rows = slab_ids == slab_id
+        neg, mag = divmod(int(slab_id), len(SUFFIXES))
+        labels[rows] = _slab(bool(neg), mag)[rounded[rows]]
+
+    # Tenths sitting on a rounding tie are decided by the exact binary value,
+    # which only '%.1f' itself gets right; the same goes for anything outside
+    # the table (NaN, inf, beyond 1000P).
+    tie = np.abs(tenths - np.trunc(tenths) - 0.5) < 1e-6
+    for i in np.flatnonzero(tie | ~finite):
+        labels[i] = '%.1f%s' % (scaled[i], SUFFIXES[magnitude[i]])
+    return labels
+
+
+def human_format(num):
+    """Label numbers as '1.4B', '331.0M', ... (one decimal, K/M/B/T/P suffixes).
+
+    Accepts a scalar (returns a str) or a Series/array (returns the same kind,
+    labelled in one vectorized pass).
+    """
+    if np.ndim(num) == 0:
+        return human_format(np.array([num]))[0]
+
+    values = np.asarray(num, dtype=np.float64)
+    magnitude = _magnitudes(values)
+    scaled = values / 1000.0 ** magnitude
+    labels = _labels(scaled, magnitude)
+
+    if isinstance(num, pd.Series):
+        return pd.Series(labels, index=num.index, name=num.name)
+    return labels
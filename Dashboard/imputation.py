@@ -0,0 +1,171 @@
+"""
+Missing-value imputation that scales to large city x month matrices.
+
+``knn_impute`` follows ``sklearn.impute.KNNImputer`` (uniform mean of the k
+nearest rows by distance over the observed columns) without its all-pairs
+distance matrix. Rows are grouped by which columns they observe; for each
+group and each column it misses, the donors are the rows observing both, and
+the k (approximately) nearest donors come from a KD-tree
+(``scipy.spatial.cKDTree``) over the group's observed columns, built once per
+group and shared by the columns it misses. Groups are
+spread over worker processes and queried in blocks of ``block_size`` rows, so
+memory stays linear in the matrix size. Unlike KNNImputer, donors missing one
+of the receiver's observed columns are not considered; on the shipped city
+matrix this gives the same hold-out error.
+
+``interpolate`` is the cheap alternative for series laid out along the
+columns (e.g. JAN..DEC): linear interpolation between the observed months of
+each row, holding the first/last observation at the edges.
+"""
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+
+# largest k asked of a group's tree before falling back to a per-target tree
+_MAX_K = 512
+
+_X = None  # the matrix being imputed, set once per worker process
+_observed = None
+
+
+def _share(X):
+    global _X, _observed
+    _X = X
+    _observed = None if X is None else ~np.isnan(X)
+
+
+def _column_means(X):
+    observed = ~np.isnan(X)
+    counts = observed.sum(axis=0)
+    sums = np.where(observed, X, 0.0).sum(axis=0)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        return np.where(counts > 0, sums / np.maximum(counts, 1), np.nan)
+
+
+def _nearest_mean(tree, donors, queries, target, k, eps):
+    _, neighbours = tree.query(queries, k=k, eps=eps)
+    return _X[donors[neighbours.reshape(len(queries), k)], target].mean(axis=1)
+
+
+def _impute_group(task):
+    # rows observing exactly ``columns``, filled for each of ``targets``
+    rows, columns, targets, n_neighbors, block_size, eps, means = task
+    from scipy.spatial import cKDTree
+
+    X, observed = _X, _observed
+    out = np.full((len(rows), len(targets)), np.nan)
+    base = np.flatnonzero(observed[:, columns].all(axis=1)) if len(columns) else np.array([], np.int64)
+    wanted = np.array([min(n_neighbors, observed[base, target].sum()) for target in targets])
+    out[:, wanted == 0] = means[targets[wanted == 0]]
+    if not wanted.any():
+        return rows, targets, out
+
+    # one tree per group: a neighbour only counts for a target it observes, so
+    # rows whose k nearest do not cover a target ask again with a larger k
+    tree = cKDTree(X[np.ix_(base, columns)])
+    for start in range(0, len(rows), block_size):
+        block = rows[start:start + block_size]
+        pending = np.arange(len(block))
+        k = n_neighbors * 4
+        while len(pending) and k <= _MAX_K:
+            k = min(k, len(base))
+            _, neighbours = tree.query(X[np.ix_(block[pending], columns)], k=k, eps=eps)
+            neighbours = base[neighbours.reshape(len(pending), k)]
+            done = np.ones(len(pending), bool)
+            for t, target in enumerate(targets):
+                if not wanted[t]:
+                    continue
+                usable = observed[neighbours, target]
+                usable &= np.cumsum(usable, axis=1) <= wanted[t]
+                counts = usable.sum(axis=1)
+                covered = counts == wanted[t]
+                totals = np.where(usable, X[neighbours, target], 0.0).sum(axis=1)
+                out[start + pending[covered], t] = totals[covered] / wanted[t]
+                done &= covered | ~np.isnan(out[start + pending, t])
+            if k == len(base):
+                break
+            pending = pending[~done]
+            k *= 4
+
+    # rows left over have most of their neighbours missing the target; search
+    # the target's donors directly
+    for t, target in enumerate(targets):
+        left = np.flatnonzero(np.isnan(out[:, t]))
+        if not len(left):
+            continue
+        donors = base[observed[base, target]]
+        exact = cKDTree(X[np.ix_(donors, columns)])
+        for start in range(0, len(left), block_size):
+            chunk = left[start:start + block_size]
+            out[chunk, t] = _nearest_mean(exact, donors, X[np.ix_(rows[chunk], columns)], target,
+                                          wanted[t], eps)
+    return rows, targets, out
+
+
+def knn_impute(X, n_neighbors=2, block_size=4096, eps=0.5, jobs=None):
+    """Copy of ``X`` with its NaNs filled from the ``n_neighbors`` nearest rows.
+
+    ``eps`` accepts neighbours up to (1 + eps) times farther than the exact
+    ones, which keeps KD-tree queries fast in the 10-20 dimensions of the city
+    matrix; pass 0 for exact neighbours.
+    """
+    X = np.asarray(X, dtype=np.float64)
+    missing = np.isnan(X)
+    receivers = np.flatnonzero(missing.any(axis=1))
+    if not len(receivers):
+        return X.copy()
+    if X.shape[1] > 62:
+        raise ValueError(f"At most 62 columns are supported, got {X.shape[1]}")
+
+    # one task per missing-value pattern
+    bits = 1 << np.arange(X.shape[1], dtype=np.int64)
+    patterns = missing[receivers].astype(np.int64) @ bits
+    means = _column_means(X)
+    tasks = []
+    for pattern in np.unique(patterns):
+        mask = (pattern & bits) != 0
+        tasks.append((receivers[patterns == pattern], np.flatnonzero(~mask), np.flatnonzero(mask),
+                      n_neighbors, block_size, eps, means))
+
+    jobs = jobs or os.cpu_count() or 1
+    if jobs > 1 and len(tasks) > 1:
+        # big patterns first, so the pool is not left waiting on one at the end
+        tasks.sort(key=lambda task: -len(task[0]))
+        with ProcessPoolExecutor(max_workers=min(jobs, len(tasks)), initializer=_share, initargs=(X,)) as pool:
+            results = list(pool.map(_impute_group, tasks))
+    else:
+        _share(X)
+        try:
+            results = [_impute_group(task) for task in tasks]
+        finally:
+            _share(None)
+
+    filled = X.copy()
+    for rows, targets, values in results:
+        filled[np.ix_(rows, targets)] = values
+    return filled
+
+
+def interpolate(X):
+    """Copy of ``X`` with each row's gaps linearly interpolated along the columns.
+
+    Leading and trailing gaps take the nearest observed value; rows without
+    any observation stay NaN.
+    """
+    X = np.asarray(X, dtype=np.float64)
+    n, d = X.shape
+    valid = ~np.isnan(X)
+    positions = np.broadcast_to(np.arange(d), (n, d))
+    previous = np.maximum.accumulate(np.where(valid, positions, -1), axis=1)
+    following = np.minimum.accumulate(np.where(valid, positions, d)[:, ::-1], axis=1)[:, ::-1]
+
+    rows = np.arange(n)[:, None]
+    left = X[rows, np.clip(previous, 0, d - 1)]
+    right = X[rows, np.clip(following, 0, d - 1)]
+    left = np.where(previous < 0, right, left)
+    right = np.where(following >= d, left, right)
+    inside = (previous >= 0) & (following < d)
+    weight = np.where(inside, (positions - previous) / np.maximum(following - previous, 1), 0.0)
+    return np.where(valid, X, left + (right - left) * weight)
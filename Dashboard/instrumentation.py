@@ -0,0 +1,208 @@
+"""
+Per-section timing and memory profile of homepage reruns.
+
+Off by default. Set DASHBOARD_PROFILE (or open the page with ``?profile=``)
+to ``time`` for wall times only, or to ``1``/``memory`` to also trace Python
+allocations with tracemalloc, which slows the run down noticeably.
+
+Every section run (full page or fragment rerun) then produces one record: its
+wall time and allocation peak, split into phases
+
+- ``load``: dataset, view and store reads (functions decorated with
+  ``measured("load")``),
+- ``figure``: figure cache lookups/builds and decimation,
+- ``serialize``: ``st.plotly_chart`` calls, with the size of the figure JSON,
+- ``transform``: the rest of the section (pandas work, figures built inline,
+  other elements).
+
+Records are appended as JSON lines to DASHBOARD_PROFILE_LOG (default
+data/profile.jsonl) and kept in the session for the sidebar diagnostics
+panel. Phases nest: time spent in a load called from a figure build counts as
+figure. tracemalloc is process-wide, so allocation numbers are only clean
+while one session is running.
+"""
+import contextvars
+import functools
+import json
+import os
+import threading
+import time
+import tracemalloc
+import uuid
+from contextlib import contextmanager
+from datetime import datetime, timezone
+
+
+PHASES = ("load", "transform", "figure", "serialize")
+
+LOG_PATH = os.environ.get("DASHBOARD_PROFILE_LOG") or os.path.normpath(
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir, "data", "profile.jsonl"))
+
+# records kept per session for the sidebar
+HISTORY = 200
+
+_MODES = {"time": "time", "1": "memory", "memory": "memory", "true": "memory"}
+
+_current = contextvars.ContextVar("profiled_section", default=None)
+_log_lock = threading.Lock()
+
+
+def mode():
+    """None, "time" or "memory", from the environment or the page's query string."""
+    value = os.environ.get("DASHBOARD_PROFILE", "").lower()
+    if not value:
+        import streamlit as st
+
+        try:
+            value = st.query_params.get("profile", "").lower()
+        except Exception:  # not running inside a Streamlit script
+            value = ""
+    return _MODES.get(value)
+
+
+class SectionRecord:
+    def __init__(self, name, memory):
+        self.name = name
+        self.memory = memory
+        self.phases = {}
+        self.charts = 0
+        self.chart_bytes = 0
+        self.peak = 0
+        self.overhead = 0.0  # time spent measuring, left out of the phases
+        self._depth = 0
+
+    def _traced(self):
+        return tracemalloc.get_traced_memory() if self.memory else (0, 0)
+
+    @contextmanager
+    def phase(self, name):
+        if self._depth:
+            yield
+            return
+        self._depth += 1
+        current, _ = self._traced()
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            seconds = time.perf_counter() - start
+            allocated = self._traced()[0] - current
+            self._depth -= 1
+            entry = self.phases.setdefault(name, {"seconds": 0.0, "bytes": 0, "calls": 0})
+            entry["seconds"] += seconds
+            entry["bytes"] += allocated
+            entry["calls"] += 1
+
+    def chart(self, fig):
+        import plotly.io as pio
+
+        start = time.perf_counter()
+        if self.memory:
+            self.peak = max(self.peak, tracemalloc.get_traced_memory()[1])
+        self.charts += 1
+        self.chart_bytes += len(pio.to_json(fig, validate=False))
+        if self.memory:
+            tracemalloc.reset_peak()
+        self.overhead += time.perf_counter() - start
+
+
+@contextmanager
+def phase(name):
+    """Count the enclosed block as phase ``name`` of the section being profiled."""
+    record = _current.get()
+    if record is None:
+        yield
+    else:
+        with record.phase(name):
+            yield
+
+
+def measured(name):
+    """Decorator counting every call of the function as phase ``name``."""
+    def wrap(fn):
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            if _current.get() is None:
+                return fn(*args, **kwargs)
+            with phase(name):
+                return fn(*args, **kwargs)
+        return wrapper
+    return wrap
+
+
+def record_chart(fig):
+    """Note that ``fig`` was sent to the browser (and how large its JSON is)."""
+    record = _current.get()
+    if record is not None:
+        record.chart(fig)
+
+
+def _write(entry):
+    line = json.dumps(entry) + "\n"
+    with _log_lock:
+        try:
+            os.makedirs(os.path.dirname(LOG_PATH), exist_ok=True)
+            with open(LOG_PATH, "a", encoding="utf-8") as f:
+                f.write(line)
+        except OSError:
+            pass
+
+
+def profiled(name, render, versions=None):
+    """Wrap a section's ``render`` so each run is profiled while profiling is on.
+
+    ``versions`` returns the versions of the data the section reads; they are
+    logged with the record so timings can be compared across data updates.
+    """
+    @functools.wraps(render)
+    def run():
+        active = mode()
+        if active is None or _current.get() is not None:
+            return render()
+
+        import streamlit as st
+
+        memory = active == "memory"
+        if memory:
+            if not tracemalloc.is_tracing():
+                tracemalloc.start()
+            tracemalloc.reset_peak()
+        record = SectionRecord(name, memory)
+        current = tracemalloc.get_traced_memory()[0] if memory else 0
+        token = _current.set(record)
+        start = time.perf_counter()
+        try:
+            return render()
+        finally:
+            seconds = time.perf_counter() - start - record.overhead
+            _current.reset(token)
+            phases = {"transform": {"seconds": max(seconds - sum(p["seconds"] for p in record.phases.values()), 0.0),
+                                    "bytes": 0, "calls": 1}}
+            phases.update(record.phases)
+            entry = {
+                "time": datetime.now(timezone.utc).isoformat(timespec="milliseconds"),
+                "session": st.session_state.setdefault("_profile_session", uuid.uuid4().hex[:8]),
+                "section": name,
+                "seconds": seconds,
+                "phases": {p: phases[p] for p in PHASES if p in phases},
+                "charts": record.charts,
+                "chart_bytes": record.chart_bytes,
+                "versions": versions() if versions else {},
+            }
+            if memory:
+                now, peak = tracemalloc.get_traced_memory()
+                entry["peak_bytes"] = max(peak, record.peak) - current
+                entry["net_bytes"] = now - current
+                phases["transform"]["bytes"] = entry["net_bytes"] - sum(p["bytes"] for p in record.phases.values())
+            _write(entry)
+            history = st.session_state.setdefault("_profile", [])
+            history.append(entry)
+            del history[:-HISTORY]
+    return run
+
+
+def history():
+    """Records of the current session, oldest first."""
+    import streamlit as st
+
+    return list(st.session_state.get("_profile", ()))
@@ -0,0 +1,256 @@
+"""
+Append-only ingestion of daily ISPU readings.
+
+``IspuAccumulator`` holds everything the Yogyakarta section derives from the
+readings (category and critical component counts, per-pollutant running
+statistics, exact quantiles and the co-moments behind the correlation matrix)
+and folds new rows in with O(new rows) work: batch statistics are merged with
+the pairwise update of Chan et al. instead of being recomputed.
+
+``IspuFeed`` ties an accumulator to the CSV file. It remembers how many bytes
+of the file it has consumed, so rows appended to the file (through
+``ingest()`` or by any other writer) are picked up by reading only the new
+tail. A file that was rewritten rather than appended to is re-read in full.
+A consumer that keeps its own copy of the rows (the ISPU store, see
+ispu_store.py) ``resume()``s the feed where that copy ends and ``drain()``s
+the new tails to apply them.
+"""
+import hashlib
+import io
+import os
+import threading
+
+import numpy as np
+import pandas as pd
+
+import data_loader
+
+
+POLLUTANTS = ['PM10', 'SO2', 'CO', 'O3', 'NO2', 'Max']
+
+COLUMNS = ['Date'] + POLLUTANTS + ['Critical Component', 'Category']
+
+DATE_FORMAT = "%m/%d/%Y"
+
+# ISPU is reported as whole index points; the histogram used for quantiles has
+# one bin per point and clamps anything above the top of the scale
+MAX_INDEX = 1000
+
+
+def _observed(labels):
+    # value counts without the unused categories of a categorical column, by plain label
+    counts = labels.value_counts()
+    counts = counts[counts > 0]
+    counts.index = counts.index.astype(object)
+    return counts
+
+
+class IspuAccumulator:
+    def __init__(self, columns=POLLUTANTS):
+        self.columns = list(columns)
+        k = len(self.columns)
+        self.n = 0
+        self.mean = np.zeros(k)
+        self.comoment = np.zeros((k, k))  # sum of (x - mean)(x - mean)^T
+        self.minimum = np.full(k, np.inf)
+        self.maximum = np.full(k, -np.inf)
+        self.histogram = np.zeros((k, MAX_INDEX + 1), dtype=np.int64)
+        self.categories = pd.Series(dtype=np.int64)
+        self.critical = pd.Series(dtype=np.int64)
+        self.last_date = None
+
+    def update(self, rows):
+        """Fold the readings in ``rows`` into the running state."""
+        if rows.empty:
+            return
+        X = rows[self.columns].to_numpy(dtype=np.float64)
+        m = len(X)
+        batch_mean = X.mean(axis=0)
+        centered = X - batch_mean
+        batch_comoment = centered.T @ centered
+
+        total = self.n + m
+        delta = batch_mean - self.mean
+        self.comoment += batch_comoment + np.outer(delta, delta) * (self.n * m / total)
+        self.mean += delta * (m / total)
+        self.n = total
+
+        self.minimum = np.minimum(self.minimum, X.min(axis=0))
+        self.maximum = np.maximum(self.maximum, X.max(axis=0))
+        bins = np.clip(np.rint(X), 0, MAX_INDEX).astype(np.int64)
+        for i in range(len(self.columns)):
+            self.histogram[i] += np.bincount(bins[:, i], minlength=MAX_INDEX + 1)
+
+        self.categories = self.categories.add(_observed(rows["Category"]), fill_value=0).astype(np.int64)
+        self.critical = self.critical.add(_observed(rows["Critical Component"]), fill_value=0).astype(np.int64)
+
+        dates = pd.to_datetime(rows["Date"], format=DATE_FORMAT)
+        self.last_date = dates.max() if self.last_date is None else max(self.last_date, dates.max())
+
+    def _counts(self, counts, name):
+        # ties keep the alphabetical order groupby().count() would give
+        frame = counts.sort_index().rename_axis(name).rename("count").reset_index()
+        return frame.sort_values(by="count", ascending=False, kind="stable").reset_index(drop=True)
+
+    def category_counts(self):
+        """Frame of Category and count, most frequent first."""
+        return self._counts(self.categories, "Category")
+
+    def critical_counts(self):
+        """Frame of Critical Component and count, most frequent first."""
+        return self._counts(self.critical, "Critical Component")
+
+    def quantiles(self, q):
+        """Quantiles (lower interpolation) of each pollutant from the histogram."""
+        q = np.atleast_1d(q)
+        cumulative = self.histogram.cumsum(axis=1)
+        targets = np.ceil(q * self.n).clip(1, None)
+        out = np.array([np.searchsorted(cumulative[i], targets) for i in range(len(self.columns))])
+        return pd.DataFrame(out, index=self.columns, columns=q)
+
+    def stats(self):
+        variance = self.comoment.diagonal() / (self.n - 1) if self.n > 1 else np.full(len(self.columns), np.nan)
+        frame = pd.DataFrame({
+            "count": self.n,
+            "mean": self.mean,
+            "var": variance,
+            "std": np.sqrt(variance),
+            "min": self.minimum,
+            "max": self.maximum,
+        }, index=self.columns)
+        quartiles = self.quantiles([0.25, 0.5, 0.75])
+        frame["25%"], frame["50%"], frame["75%"] = (quartiles[c] for c in quartiles.columns)
+        return frame
+
+    def correlation(self):
+        """Pearson matrix from the co-moments; NaN for constant columns."""
+        scale = np.sqrt(self.comoment.diagonal())
+        constant = scale == 0
+        scale[constant] = 1.0
+        r = np.clip(self.comoment / np.outer(scale, scale), -1.0, 1.0)
+        r[constant, :] = np.nan
+        r[:, constant] = np.nan
+        return pd.DataFrame(r, index=self.columns, columns=self.columns)
+
+
+def _head_digest(path, size):
+    with open(path, "rb") as f:
+        return hashlib.sha1(f.read(size)).hexdigest()
+
+
+class IspuFeed:
+    """An accumulator kept in step with an append-only CSV file."""
+
+    _HEAD_BYTES = 4096
+
+    def __init__(self, path):
+        self.path = path
+        self._lock = threading.Lock()
+        self._batches = None  # (rows, raw bytes, from the start) once a consumer resumed the feed
+        self._reset()
+
+    def _reset(self):
+        self.accumulator = IspuAccumulator()
+        self.offset = 0
+        self._head = None  # (length, digest) of the start of the file
+
+    def refresh(self):
+        """Fold in whatever was appended to the file since the last call."""
+        with self._lock:
+            size = os.path.getsize(self.path)
+            # checked before the size, a rewrite may keep the file's length
+            rewritten = size < self.offset or (
+                self._head is not None and _head_digest(self.path, self._head[0]) != self._head[1])
+            if rewritten:
+                self._reset()
+            elif size == self.offset:
+                return self.accumulator
+
+            with open(self.path, "rb") as f:
+                f.seek(self.offset)
+                tail = f.read()
+            # only consume complete lines, a writer may be mid-row
+            complete = tail.rfind(b"\n") + 1 if not tail.endswith(b"\n") else len(tail)
+            if complete:
+                chunk = tail[:complete]
+                header = 0 if self.offset == 0 else None
+                rows = pd.read_csv(io.BytesIO(chunk), header=header,
+                                   names=None if header == 0 else COLUMNS)
+                self.accumulator.update(rows)
+                if self._batches is not None:
+                    self._batches.append((rows, chunk, header == 0))
+                self.offset += complete
+                if self._head is None:
+                    length = min(self._HEAD_BYTES, self.offset)
+                    self._head = (length, _head_digest(self.path, length))
+            return self.accumulator
+
+    def resume(self, accumulator, offset=None):
+        """Continue with ``accumulator``, holding the rows before byte ``offset`` of the file.
+
+        The caller has checked that those bytes are the ones it read. With
+        ``offset`` None only the accumulator is swapped, and the rows read
+        since the last ``drain()`` are folded into it. From then on every tail
+        read is kept for ``drain()``.
+        """
+        with self._lock:
+            if offset is not None:
+                self._reset()
+                self.offset = offset
+                if offset:
+                    length = min(self._HEAD_BYTES, offset)
+                    self._head = (length, _head_digest(self.path, length))
+                self._batches = []
+            else:
+                for rows, _, _ in self._batches or []:
+                    accumulator.update(rows)
+                if self._batches is None:
+                    self._batches = []
+            self.accumulator = accumulator
+
+    def drain(self):
+        """(rows, raw bytes, from the start of the file) of each tail read since the last call."""
+        with self._lock:
+            if self._batches is None:
+                return []
+            batches, self._batches = self._batches, []
+            return batches
+
+    def ingest(self, rows):
+        """Append new daily readings to the file and fold them in.
+
+        Rows must carry the columns of the clean ISPU file and be strictly
+        newer than everything ingested so far.
+        """
+        missing = [c for c in COLUMNS if c not in rows.columns]
+        if missing:
+            raise ValueError(f"Missing ISPU columns: {missing}")
+        accumulator = self.refresh()
+        dates = pd.to_datetime(rows["Date"], format=DATE_FORMAT)
+        if accumulator.last_date is not None and (dates <= accumulator.last_date).any():
+            raise ValueError(f"Readings must be newer than {accumulator.last_date:%m/%d/%Y}")
+
+        empty = os.path.getsize(self.path) == 0
+        needs_newline = False
+        if not empty:
+            with open(self.path, "rb") as f:
+                f.seek(-1, os.SEEK_END)
+                needs_newline = f.read(1) != b"\n"
+        with open(self.path, "a", newline="") as f:
+            if needs_newline:
+                f.write("\n")
+            # a freshly created file gets the header refresh() expects
+            rows[COLUMNS].to_csv(f, header=empty, index=False, lineterminator="\n")
+        return self.refresh()
+
+
+_feeds = {}
+_feeds_lock = threading.Lock()
+
+
+def ispu_feed(dataset="ispu_jogja"):
+    """Shared feed over a registered ISPU dataset."""
+    with _feeds_lock:
+        if dataset not in _feeds:
+            _feeds[dataset] = IspuFeed(data_loader.dataset_path(dataset))
+        return _feeds[dataset]
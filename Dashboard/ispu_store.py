@@ -0,0 +1,314 @@
+"""
+Time-partitioned storage for ISPU readings from several stations.
+
+Readings are stored as one Parquet file per station and calendar month:
+
+    data/ispu_store/station=<station>/<YYYY-MM>.parquet
+
+with a parsed timestamp, float32 pollutant columns and categorical labels.
+Range queries only open the partitions whose month overlaps the requested
+range, and ``resample()`` answers hourly -> daily -> monthly mean/max queries
+per station on top of that.
+
+The Yogyakarta 2020 file feeds station "Yogyakarta" through an IspuFeed
+(ispu_ingest.py): rows appended to it are written to the months they fall in
+and folded into the station's cached frame and accumulator, so a new day costs
+O(new rows). The length and SHA-1 of the part of the file the store holds are
+kept next to the station's partitions, so a new process or worker reads the
+store once and the file only past that point. More stations or years can be
+added with:
+
+    python Dashboard/ispu_store.py <csv> <station>
+"""
+import hashlib
+import os
+import sys
+import threading
+
+import json
+
+import numpy as np
+import pandas as pd
+from pandas.api.types import union_categoricals
+
+import data_loader
+from instrumentation import measured
+from ispu_ingest import DATE_FORMAT, POLLUTANTS, IspuAccumulator, ispu_feed
+from snapshots import available
+
+
+STORE_DIR = os.path.join(data_loader.DATA_DIR, "ispu_store")
+
+LABELS = ['Critical Component', 'Category']
+
+DEFAULT_STATION = "Yogyakarta"
+
+# how much of the file a station is fed from it holds, next to its partitions
+SOURCE_FILE = "_source.json"
+
+
+def compact(frame):
+    """Readings with a parsed ``Timestamp`` and compact dtypes."""
+    out = pd.DataFrame(index=frame.index)
+    if "Timestamp" in frame:
+        out["Timestamp"] = pd.to_datetime(frame["Timestamp"])
+    else:
+        try:
+            out["Timestamp"] = pd.to_datetime(frame["Date"], format=DATE_FORMAT)
+        except ValueError:
+            out["Timestamp"] = pd.to_datetime(frame["Date"])
+    for column in POLLUTANTS:
+        out[column] = pd.to_numeric(frame[column], errors="coerce").astype(np.float32)
+    for column in LABELS:
+        out[column] = frame[column].astype("category")
+    return out
+
+
+class IspuStore:
+    def __init__(self, root=STORE_DIR):
+        self.root = root
+
+    def _station_dir(self, station):
+        return os.path.join(self.root, f"station={station}")
+
+    def stations(self):
+        if not os.path.isdir(self.root):
+            return []
+        return sorted(d.split("=", 1)[1] for d in os.listdir(self.root) if d.startswith("station="))
+
+    def partitions(self, station):
+        """Sorted month keys ('YYYY-MM') stored for ``station``."""
+        directory = self._station_dir(station)
+        if not os.path.isdir(directory):
+            return []
+        return sorted(f[:-len(".parquet")] for f in os.listdir(directory) if f.endswith(".parquet"))
+
+    def source(self, station):
+        """The ``source`` of the last ``write()`` to ``station`` that recorded one, or None."""
+        try:
+            with open(os.path.join(self._station_dir(station), SOURCE_FILE), encoding="utf-8") as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return None
+
+    def version(self):
+        """Changes whenever any partition is written."""
+        h = hashlib.sha1()
+        for station in self.stations():
+            for month in self.partitions(station):
+                stat = os.stat(os.path.join(self._station_dir(station), month + ".parquet"))
+                h.update(f"{station}/{month}:{stat.st_mtime_ns}:{stat.st_size};".encode())
+        return h.hexdigest()[:16]
+
+    def write(self, frame, station, source=None):
+        """Add readings for ``station``; a reading at an existing timestamp replaces it.
+
+        ``source`` (JSON, e.g. how much of the file ``frame`` came from the
+        station holds) is recorded once every partition is written, see
+        ``source()``. Only the months ``frame`` has readings in are rewritten.
+        """
+        readings = compact(frame)
+        directory = self._station_dir(station)
+        os.makedirs(directory, exist_ok=True)
+        months = readings["Timestamp"].dt.strftime("%Y-%m")
+        for month, rows in readings.groupby(months, sort=True):
+            path = os.path.join(directory, month + ".parquet")
+            if os.path.exists(path):
+                rows = pd.concat([pd.read_parquet(path), rows], ignore_index=True)
+                for column in LABELS:
+                    rows[column] = rows[column].astype(str).astype("category")
+            rows = (rows.drop_duplicates("Timestamp", keep="last")
+                        .sort_values("Timestamp").reset_index(drop=True))
+            rows.to_parquet(path + ".tmp", index=False)
+            os.replace(path + ".tmp", path)
+        if source is not None:
+            path = os.path.join(directory, SOURCE_FILE)
+            with open(path + ".tmp", "w", encoding="utf-8") as f:
+                json.dump(source, f)
+            os.replace(path + ".tmp", path)
+
+    def read(self, stations=None, start=None, end=None, columns=None):
+        """Readings between ``start`` and ``end`` (inclusive), indexed by timestamp.
+
+        Only partitions whose month overlaps the range are opened.
+        """
+        start = pd.Timestamp(start) if start is not None else None
+        end = pd.Timestamp(end) if end is not None else None
+        first = start.strftime("%Y-%m") if start is not None else None
+        last = end.strftime("%Y-%m") if end is not None else None
+        wanted = None if columns is None else ["Timestamp"] + [c for c in columns if c != "Timestamp"]
+
+        parts = []
+        for station in stations or self.stations():
+            for month in self.partitions(station):
+                if (first is not None and month < first) or (last is not None and month > last):
+                    continue
+                part = pd.read_parquet(os.path.join(self._station_dir(station), month + ".parquet"),
+                                       columns=wanted)
+                part["Station"] = station
+                parts.append(part)
+        if not parts:
+            return pd.DataFrame(columns=(wanted or ["Timestamp"] + POLLUTANTS + LABELS) + ["Station"]) \
+                .set_index("Timestamp")
+
+        readings = pd.concat(parts, ignore_index=True)
+        for column in LABELS + ["Station"]:
+            if column in readings:
+                readings[column] = readings[column].astype("category")
+        if start is not None:
+            readings = readings[readings["Timestamp"] >= start]
+        if end is not None:
+            readings = readings[readings["Timestamp"] <= end]
+        return readings.set_index("Timestamp").sort_index()
+
+    def resample(self, freq="D", how="mean", stations=None, start=None, end=None, columns=POLLUTANTS):
+        """Per-station ``how`` ('mean', 'max', ...) of ``columns`` per ``freq`` bucket."""
+        readings = self.read(stations, start, end, columns=list(columns))
+        grouped = readings.groupby(["Station", pd.Grouper(freq=freq)], observed=True)[list(columns)]
+        return grouped.agg(how)
+
+
+_lock = threading.Lock()
+_default = None
+_consumed = None  # (running sha1, length) of the bytes of the Yogyakarta file in the store
+_states = {}  # station -> (version, daily frame, IspuAccumulator)
+
+
+def _prefix_hash(path, length):
+    h = hashlib.sha1()
+    with open(path, "rb") as f:
+        while length > 0:
+            block = f.read(min(1 << 20, length))
+            if not block:
+                break
+            h.update(block)
+            length -= len(block)
+    return h
+
+
+def _daily_frame(readings):
+    # readings indexed by timestamp in the clean-file layout
+    readings = readings.drop(columns="Station")
+    readings.insert(0, "Date", readings.index)
+    return readings.reset_index(drop=True)
+
+
+def _appended(frame, rows):
+    # ``frame`` followed by the newer readings ``rows``, labels kept categorical
+    new = compact(rows).rename(columns={"Timestamp": "Date"}).reset_index(drop=True)
+    out = pd.concat([frame.drop(columns=LABELS), new.drop(columns=LABELS)], ignore_index=True)
+    for column in LABELS:
+        out[column] = union_categoricals([frame[column], new[column]])
+    return out
+
+
+def _load_state(store, station):
+    # (version, frame, accumulator) read from the partitions (caller holds _lock)
+    version = store.version()
+    frame = _daily_frame(store.read(stations=[station]))
+    accumulator = IspuAccumulator()
+    accumulator.update(frame)
+    _states[station] = (version, frame, accumulator)
+    if station == DEFAULT_STATION:
+        # the feed goes on folding new rows into it
+        ispu_feed("ispu_jogja").resume(accumulator)
+    return _states[station]
+
+
+def _resume(store, feed):
+    # pick the feed up where the store's copy of the file ends (caller holds _lock)
+    global _consumed
+    source = store.source(DEFAULT_STATION)
+    path = data_loader.dataset_path("ispu_jogja")
+    if source is not None and os.path.getsize(path) >= source["length"]:
+        h = _prefix_hash(path, source["length"])
+        if h.hexdigest() == source["sha1"]:
+            accumulator = _load_state(store, DEFAULT_STATION)[2]
+            feed.resume(accumulator, source["length"])
+            _consumed = (h, source["length"])
+            return
+    # no copy or another file: read it all and merge it into the station
+    feed.resume(IspuAccumulator(), 0)
+    _consumed = (hashlib.sha1(), 0)
+
+
+def _sync(store):
+    # write what was appended to the Yogyakarta file since the last call (caller holds _lock)
+    global _consumed
+    feed = ispu_feed("ispu_jogja")
+    if _consumed is None:
+        _resume(store, feed)
+    feed.refresh()
+    for rows, chunk, from_start in feed.drain():
+        h, length = (hashlib.sha1(), 0) if from_start else _consumed
+        h.update(chunk)
+        _consumed = (h, length + len(chunk))
+        before = store.version()
+        # only the months of the new rows are rewritten
+        store.write(rows, DEFAULT_STATION, source={"length": _consumed[1], "sha1": h.hexdigest()})
+        state = _states.get(DEFAULT_STATION)
+        if from_start or state is None or state[0] != before:
+            # read again from the partitions on the next query
+            _states.pop(DEFAULT_STATION, None)
+        else:
+            # the feed has already folded the rows into the accumulator
+            _states[DEFAULT_STATION] = (store.version(), _appended(state[1], rows), state[2])
+
+
+def default_store():
+    """The shared store, kept in step with the Yogyakarta file.
+
+    Rows appended to the file (see ispu_ingest.py) are written to the store
+    the next time it is asked for, touching only their months. Returns None
+    when pyarrow is not installed.
+    """
+    global _default
+    if not available():
+        return None
+    with _lock:
+        if _default is None:
+            _default = IspuStore()
+        _sync(_default)
+        return _default
+
+
+def _state(store, station):
+    version = store.version()
+    with _lock:
+        state = _states.get(station)
+        if state is None or state[0] != version:
+            state = _load_state(store, station)
+        return state
+
+
+@measured("load")
+def daily_readings(station=DEFAULT_STATION):
+    """(version, frame) of the readings of a daily ``station`` in the clean-file layout.
+
+    Falls back to the clean CSV when the store is unavailable. Stations with
+    sub-daily readings go through ``resample()`` instead.
+    """
+    store = default_store()
+    if store is None:
+        return data_loader.dataset_digest("ispu_jogja"), data_loader.load_dataset("ispu_jogja")
+    version, frame, _ = _state(store, station)
+    return version, frame
+
+
+def daily_summary(station=DEFAULT_STATION):
+    """(version, IspuAccumulator) over the same readings as ``daily_readings(station)``.
+
+    Rows appended to the Yogyakarta file are folded into it as they arrive
+    instead of being counted again. The category and critical component
+    counts and the correlations of the section come from it.
+    """
+    store = default_store()
+    if store is None:
+        return data_loader.dataset_digest("ispu_jogja"), ispu_feed("ispu_jogja").refresh()
+    version, _, accumulator = _state(store, station)
+    return version, accumulator
+
+if __name__ == "__main__":
+    if len(sys.argv) != 3:
+        sys.exit("usage: python Dashboard/ispu_store.py <csv> <station>")
+    IspuStore().write(pd.read_csv(sys.argv[1]), sys.argv[2])
@@ -0,0 +1,126 @@
+"""
+Per-entity, per-year prefix sums for range queries over yearly time series.
+
+Each source in SOURCES is turned, once per version of its data, into a dense
+(entity, year, value) cube summed cumulatively along the years. The total of
+an entity over any year range is then the difference of two prefix rows, so
+``totals``/``shares`` cost O(1) per selected entity (and O(1) for all
+entities, which have their own prefix) whatever the length of the range, and
+``yearly`` only touches the selected entities and years.
+
+The cube holds entities x years x (values + 1) numbers of 8 bytes or less:
+the shipped files take a few hundred KB, a 100x copy about 20-40 MB per
+source.
+"""
+import threading
+
+import numpy as np
+import pandas as pd
+
+import data_loader
+from aggregates import data_version, get_view
+from instrumentation import measured
+
+
+class RangeSums:
+    def __init__(self, frame, entity, values, year="Year"):
+        codes, names = pd.factorize(frame[entity], sort=True)
+        present = codes >= 0
+        years = frame[year].to_numpy()[present].astype(np.int64)
+        codes = codes[present]
+        self.names = list(names)
+        self.values = list(values)
+        self.first_year = int(years.min()) if len(years) else 0
+        self.last_year = int(years.max()) if len(years) else -1
+        span = self.last_year - self.first_year + 1
+
+        data = np.nan_to_num(frame[self.values].to_numpy()[present])
+        cube = np.zeros((len(self.names), span, len(self.values)), dtype=np.result_type(data.dtype, np.int64))
+        np.add.at(cube, (codes, years - self.first_year), data)
+        # prefix[e, i] is the sum over the years before first_year + i
+        self._prefix = np.zeros((len(self.names), span + 1, len(self.values)), dtype=cube.dtype)
+        np.cumsum(cube, axis=1, out=self._prefix[:, 1:])
+        self._all = self._prefix.sum(axis=0)
+        # the same for the number of rows, to tell years without data from zeros
+        rows = np.zeros((len(self.names), span), dtype=np.int32)
+        np.add.at(rows, (codes, years - self.first_year), 1)
+        self._rows = np.zeros((len(self.names), span + 1), dtype=np.int32)
+        np.cumsum(rows, axis=1, out=self._rows[:, 1:])
+        self._all_rows = self._rows.sum(axis=0)
+        self._position = {name: code for code, name in enumerate(self.names)}
+
+    def _span(self, start, end):
+        # [lo, hi) positions of the years start-end, clipped to the data
+        span = self.last_year - self.first_year + 1
+        lo = 0 if start is None else min(max(int(start) - self.first_year, 0), span)
+        hi = span if end is None else min(max(int(end) - self.first_year + 1, lo), span)
+        return lo, hi
+
+    def _codes(self, entities):
+        return np.array([self._position[e] for e in entities if e in self._position], dtype=np.int64)
+
+    def totals(self, entities=None, start=None, end=None):
+        """Sum of each value over ``entities`` (all when None) and the years ``start``-``end``."""
+        lo, hi = self._span(start, end)
+        if entities is None:
+            sums = self._all[hi] - self._all[lo]
+        else:
+            codes = self._codes(entities)
+            sums = (self._prefix[codes, hi] - self._prefix[codes, lo]).sum(axis=0)
+        return pd.Series(sums, index=self.values)
+
+    def shares(self, entities=None, start=None, end=None):
+        """Each value's share of their total over the same selection (NaN when it is zero)."""
+        totals = self.totals(entities, start, end)
+        whole = totals.sum()
+        return totals / whole if whole else totals * np.nan
+
+    def yearly(self, entities=None, start=None, end=None):
+        """Frame of Year and the values summed over ``entities``, one row per year with data."""
+        lo, hi = self._span(start, end)
+        if entities is None:
+            prefix, rows = self._all[lo:hi + 1], self._all_rows[lo:hi + 1]
+        else:
+            codes = self._codes(entities)
+            prefix = self._prefix[codes, lo:hi + 1].sum(axis=0)
+            rows = self._rows[codes, lo:hi + 1].sum(axis=0)
+        frame = pd.DataFrame(np.diff(prefix, axis=0), columns=self.values)
+        frame.insert(0, "Year", np.arange(self.first_year + lo, self.first_year + hi))
+        frame = frame[np.diff(rows) > 0].reset_index(drop=True)
+        if frame[self.values].dtypes.eq(np.float64).all():
+            # differences of cumulative sums carry rounding noise
+            frame[self.values] = frame[self.values].round(6)
+        return frame
+
+
+def _electricity():
+    return data_loader.load_dataset("electricity")
+
+
+def _co2_annual():
+    return get_view("co2_by_region_year")
+
+
+# name -> (source datasets, frame loader, entity column, value columns)
+SOURCES = {
+    "electricity": (("electricity",), _electricity, "Entity",
+                    ["Fossil_Energy", "Nuclear_Energy", "Renewable_Electricity"]),
+    "co2_annual": (("co2_annual",), _co2_annual, "Entity", ["Co2Emissions"]),
+}
+
+
+_lock = threading.Lock()
+_sums = {}  # name -> (version, RangeSums)
+
+
+@measured("load")
+def range_sums(name):
+    """Prefix sums of source ``name`` at the current version of its data."""
+    datasets, load, entity, values = SOURCES[name]
+    version = data_version(*datasets)
+    with _lock:
+        cached = _sums.get(name)
+        if cached is None or cached[0] != version:
+            cached = (version, RangeSums(load(), entity, values))
+            _sums[name] = cached
+        return cached[1]
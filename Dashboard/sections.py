@@ -0,0 +1,706 @@
+"""
+The homepage split into independently executed sections.
+
+Each section declares the datasets/views it reads (``inputs``) and the widgets
+it owns (``widgets``). Sections that own widgets run as Streamlit fragments, so
+changing one of their widgets reruns and re-sends only that section instead of
+the whole page. Sections marked ``lazy`` sit below the fold and are only
+executed once the visitor switches their group on.
+
+The homepage renders everything through ``render_page()``; sections appear in
+the order they are registered below.
+"""
+import itertools
+
+import streamlit as st
+import pandas as pd
+import numpy as np
+
+import plotly.express as px
+import plotly.graph_objs as go
+from plotly.subplots import make_subplots
+
+from data_loader import dataset_digest
+from aggregates import VIEWS, energy_mix_frame, view_version
+from figure_cache import cached_figure
+from correlation import correlations
+from feature_importance import BOOTSTRAP, CONFIDENCE, EXPENSIVE, METHODS, PERMUTATION_REPEATS
+from feature_importance import LABELS as IMPORTANCE_LABELS, feature_importance
+from formatting import human_format
+from data_explorer import data_explorer
+from ispu_store import daily_readings, daily_summary
+from decimation import decimate, decimation_note
+from air_index import EPA
+from country_index import country_index
+from decoupling import gdp_co2_panel
+from carbon_tax import COLUMNS, DEFAULT_SCENARIOS, scenario_series, scenario_summary, scenario_table
+from instrumentation import phase, profiled, record_chart
+from static_figures import co2_by_year_figure, energy_mix_figure, static_figure
+from range_sums import range_sums
+
+
+SECTIONS = []
+
+# Labels of the lazy groups below the fold
+ISPU_GROUP = "Show the Yogyakarta ISPU analysis"
+CO2_GROUP = "Show the CO2 emissions and carbon tax analysis"
+
+categoricals = ['Critical Component',	'Category']
+
+numericals = ['PM10',	'SO2',	'CO',	'O3',	'NO2',	'Max']
+
+
+def section(name, inputs=(), widgets=(), lazy=None, fragment=True):
+    """Register a section; ``lazy`` is the label of the toggle that reveals it.
+
+    ``fragment=False`` keeps a section with widgets out of a fragment, for
+    widgets that later sections read and that must rerun the whole page.
+    """
+    def register(render):
+        run = profiled(name, render, versions=lambda: input_versions(inputs))
+        SECTIONS.append({
+            "name": name,
+            "render": st.fragment(run) if widgets and fragment else run,
+            "inputs": inputs,
+            "widgets": widgets,
+            "lazy": lazy,
+        })
+        return render
+    return register
+
+
+def input_versions(inputs):
+    # short content versions of a section's datasets and views, for the profile log
+    return {name: (view_version(name) if name in VIEWS else dataset_digest(name))[:12] for name in inputs}
+
+
+@st.fragment
+def _lazy_group(label, members):
+    # The toggle lives inside the fragment so switching it on only runs this group
+    if st.toggle(label, key="lazy_" + members[0]["name"]):
+        for member in members:
+            member["render"]()
+
+
+def render_page():
+    for lazy, members in itertools.groupby(SECTIONS, key=lambda s: s["lazy"]):
+        if lazy is None:
+            for member in members:
+                member["render"]()
+        else:
+            _lazy_group(lazy, list(members))
+
+
+DEFAULT_COUNTRIES = ["Indonesia"]
+
+
+def selected_countries():
+    # chosen in the city ranking section, read by the sections after it
+    return st.session_state.get("countries") or DEFAULT_COUNTRIES
+
+
+def _reset_cities():
+    # let the city picker fall back to its defaults for the new countries
+    st.session_state.pop("city", None)
+
+
+def countries_label(countries):
+    return ", ".join(countries) if len(countries) <= 3 else f"{len(countries)} Countries"
+
+
+def country_cities(countries):
+    # cities of the selected countries, sliced through the country index
+    return country_index("aqi_cities").select(countries)
+
+
+def chart(fig):
+    # every figure goes through here so its serialization shows up in the profile;
+    # figures passed through decimation.decimate report how many points were dropped
+    with phase("serialize"):
+        st.plotly_chart(fig, use_container_width=True)
+    record_chart(fig)
+    note = decimation_note(fig)
+    if note:
+        st.caption(note)
+
+
+### DATA EXPLORER ###
+
+@section("data_source", inputs=("aqi_cities", "aqi_countries", "ispu_jogja", "gdp", "co2_per_capita",
+                                "electricity", "co2_annual", "vehicles", "vehicles_province", "population"))
+def data_source():
+    row2_spacer1, row2_1, row2_spacer2 = st.columns((.2, 7.1, .2))
+    with row2_1:
+        st.subheader('Data Source')
+        st.markdown("_Source 10 Data : IQAir website,  Dinas Lingkungan Hidup, BPS, World Bank, Ember_")
+
+        st.markdown("You can click here to see the raw data first 👇")
+
+        data_explorer("aqi_cities", 'AIR QUALITY INDEX (by cities)')
+        data_explorer("aqi_countries", 'AIR QUALITY INDEX (top countries)')
+        data_explorer("ispu_jogja", 'Pollutant Standards Index Jogja 2020')
+        data_explorer("gdp", 'GDP Per Capita')
+        data_explorer("co2_per_capita", 'CO2 Emissions Per Capita')
+        data_explorer("electricity", 'Electricity Generated Year')
+        data_explorer("co2_annual", 'Annual CO Emissions by Region')
+        data_explorer("vehicles", 'Perkembangan Jumlah Kendaraan Bermotor Menurut Jenis (Unit), 2018-2020')
+        data_explorer("vehicles_province", 'Jumlah Kendaraan Bermotor Menurut Provinsi dan Jenis Kendaraan (unit)')
+        data_explorer("population", 'Jumlah Penduduk Hasil Proyeksi Menurut Provinsi dan Jenis Kelamin (Ribu Jiwa), 2018-2020')
+    st.text('')
+
+
+#############################################################
+# 01. Most Polluted Cities and Countries (IQAir Index).ipynb
+#############################################################
+
+@section("iqair_rankings", inputs=("top20_countries", "top11_17_yearly", "top10_population"))
+def iqair_rankings():
+    row3_spacer1, row3_1, row3_spacer2 = st.columns((.2, 7.1, .2))
+    with row3_1:
+        st.subheader('Most Polluted Cities and Countries (IQAir Index)')
+        st.markdown("##### _Is it true that Indonesia has a very bad air index?_")
+        st.markdown('')
+
+    row4_spacer1, row4_1, row4_spacer2, row4_2, row4_spacer3  = st.columns((.2, 4.4, 0.1, 6.4, .2))
+    with row4_1:
+
+        # the same breakpoints air_index.EPA computes indices with
+        aqi_tb = EPA.table()
+        st.table(data=aqi_tb.reset_index(drop=True))
+
+        ### Top 10 Polluted Country In World ###
+        chart(static_figure("top20_countries"))
+
+
+    with row4_2:
+        chart(static_figure("top11_17_yearly"))
+
+        st.markdown("""
+        * It can be seen that **Indonesia** has a **17th Rating** with an AQI (Air Quality Index) value of **34.3** so it is considered **Good**.
+        * The value of AQI (Air Quality Index) in Indonesia in **2018** was **42**
+        * Then it rose 9.7 in **2019** by **51.7**
+        * Down in **2020 and 2021** maybe because of the number of vehicles and the process of activity during Covid-19.
+        """)    
+
+    row5_spacer1, row5_1, row5_spacer2, row5_2, row5_spacer3  = st.columns((.2, 6.4, 0.1, 4.4, .2))
+    with row5_1:
+        chart(static_figure("top10_population"))
+    with row5_2:
+        st.markdown("""
+        The total population in Indonesia ranks 4th:
+        * China = 1.4B
+        * India = 1.4B
+        * USA = 331M
+        * **Indonesia 273.5M**
+
+        The population of Indonesia has increased from time to time. The increase in population has a negative impact on the environment. the availability of green land as a source of clean air in urban areas is also reduced due to the many existing green lands being converted as settlements. Thus it can be said that an increase in population can lead to reduced availability of clean air. The reduced availability of clean air can also be caused by air pollution due to motor vehicle fumes.  
+        """)    
+
+
+#############################################################
+# 04. Additional Data.ipynb
+#############################################################
+
+@section("vehicles", inputs=("vehicles", "vehicles_province"))
+def vehicles():
+    row22_spacer1, row22_1, row22_spacer2, row22_2, row22_spacer3  = st.columns((.2, 6.4, 0.1, 6.4, .2))
+    with row22_1:
+        chart(static_figure("vehicles_by_year"))
+    with row22_2:
+        chart(static_figure("vehicles_by_province"))
+
+
+def city_ranking_figure(df_aqicty_indo, countries):
+    df_aqicty_indo_bar = df_aqicty_indo.copy()
+    labels = df_aqicty_indo_bar['city_only']
+    fig = go.Figure(data=[
+        go.Bar(name="2021", x=labels, y=df_aqicty_indo_bar['2021'], text=df_aqicty_indo_bar['2021']),
+        go.Bar(name="2020", x=labels, y=df_aqicty_indo_bar['2020'], text=df_aqicty_indo_bar['2020']),
+        go.Bar(name="2019", x=labels, y=df_aqicty_indo_bar['2019'], text=df_aqicty_indo_bar['2019'])
+    ])
+
+    # Change the bar mode
+    fig.update_layout(title_text='{} Average Air Quality Index by City (3 Years)'.format(countries_label(countries)))
+    # fig.update_layout(barmode='stack', xaxis={'categoryorder':'total descending'})
+    fig.update_layout(barmode='stack')
+    fig.update_layout(margin=dict(t=40, b=10))
+    fig.for_each_trace(lambda t: t.update(textfont_color="white"))
+    return fig
+
+
+# not a fragment: the country selection also drives the monthly section below
+@section("indonesia_city_ranking", inputs=("aqi_cities", "aqi_countries"), widgets=("countries",), fragment=False)
+def indonesia_city_ranking():
+    row6_spacer1, row6_1, row6_spacer2 = st.columns((.2, 7.1, .2))
+    with row6_1:
+        countries = row6_1.multiselect('Select the Country', options=country_index("aqi_cities").names,
+                                       default=DEFAULT_COUNTRIES, key="countries",
+                                       on_change=_reset_cities) or DEFAULT_COUNTRIES
+        df_aqicty_indo = country_cities(countries)
+
+        st.dataframe(data=country_index("aqi_countries").select(countries), use_container_width=True)
+        fig = cached_figure("city_ranking", ("aqi_cities",), countries,
+                            lambda: city_ranking_figure(df_aqicty_indo, countries))
+        chart(fig)
+
+
+    if countries != DEFAULT_COUNTRIES:
+        # the observations below are about Indonesia
+        return
+    row7_spacer1, row7_1, row7_spacer2, row7_2, row7_spacer3  = st.columns((.2, 4.4, 0.1, 4.4, .2))
+    with row7_1:
+        st.markdown("""
+            * Overall, air pollution has gone down in the last 4 years being year 2021 to be the lowest 
+            * Jakarta has highest average AQI score with 39.2 
+            * Indralaya in South Sumatra has lowest score with 4.2 
+        """)
+    with row7_2:
+        st.markdown("""
+            * 4 out of 5 highest polluted cities is in Java 
+            * Lowest 5 polluted cities located in Sumatra and Kalimantan Many cities have around 15-25 AQI score
+        """)
+
+
+def monthly_city_aqi_figure(df_aqicty_indo, city):
+    # line plot with plotly express
+    df_aqicty_indo_line = df_aqicty_indo.copy()
+
+    df_aqicty_indo_line = df_aqicty_indo_line[df_aqicty_indo_line["City"].isin(city)]
+    # dropping unused columns
+    df_aqicty_indo_line.drop(['2021', '2020', '2019', '2018', '2017', 'country', 'city_only'],
+                    axis=1, inplace=True)
+
+    # converting wide to long format
+    df_aqicty_indo_line = df_aqicty_indo_line.melt(id_vars = ['Rank', 'City'],
+                                var_name = "Month", 
+                                value_name = "Air Quality Index")
+
+    # filling missing values with the backfill process
+    df_aqicty_indo_line.fillna(method="bfill", inplace=True)
+
+    fig= px.line(df_aqicty_indo_line, y = 'Air Quality Index', 
+                labels = { 'Air Quality Index': 'AQI'}, 
+                x = 'Month', color = 'City',
+                title = "Monthly Air Quality Index 2021",
+                text="Air Quality Index")
+    fig.for_each_trace(lambda t: t.update(textfont_color="black", textposition='top right'))
+    fig.layout.plot_bgcolor = "light grey"
+
+    fig.update_layout(margin=dict(t=40, b=10))
+    return decimate(fig)
+
+
+@section("monthly_city_aqi", inputs=("aqi_cities",), widgets=("city",))
+def monthly_city_aqi():
+    countries = selected_countries()
+    df_aqicty_indo = country_cities(countries)
+    options = list(df_aqicty_indo["City"].unique())
+    default = [c for c in ["Jakarta, Indonesia", "Surabaya, Indonesia", "Pekanbaru, Indonesia"] if c in options] or options[:3]
+
+    row8_spacer1, row8_1, row8_spacer2 = st.columns((.2, 7.1, .2))
+    with row8_1:
+        city = row8_1.multiselect('Select the City', options=options, default=default, key="city")
+
+        fig = cached_figure("monthly_city_aqi", ("aqi_cities",), city,
+                            lambda: monthly_city_aqi_figure(df_aqicty_indo, city))
+        chart(fig)
+        if countries != DEFAULT_COUNTRIES:
+            return
+        st.markdown("""
+            * Jakarta have overall high AQI with highest on July with 57.2
+            * Pontianak has staggering rise of 86.2 AQI on November yet followed by inverse effect in cities like Bandung, Jakarta, Serang, and Jambi
+            * Indralaya experienced healthy fall of AQI after March by almost 40 points
+        """)    
+
+
+#############################################################
+# 02. Air Quality in Yogyakarta, Indonesia.ipynb
+#############################################################
+
+@section("ispu_header", inputs=())
+def ispu_header():
+    row9_spacer1, row9_1, row9_spacer2 = st.columns((.2, 7.1, .2))
+    with row9_1:
+        st.subheader('Air Quality Category and Critical Component')
+        st.markdown("##### _What are the critical components that have a high impact on Indonesian air?_")
+        st.markdown('')
+
+
+@section("ispu_categories", inputs=("ispu_jogja",), lazy=ISPU_GROUP)
+def ispu_categories():
+    version, df = daily_readings()
+    # counted over the same store readings as the box plot, see ispu_store.py
+    readings = daily_summary()[1]
+    df_catagg = readings.category_counts()
+    df_critagg = readings.critical_counts()
+
+    row10_spacer1, row10_1, row10_spacer2 = st.columns((.2, 7.1, .2))
+    with row10_1:
+        fig = make_subplots(rows=1, cols=2)
+
+        fig.add_trace(
+            go.Bar(x=df_catagg["Category"], y=df_catagg["count"], text=df_catagg["count"],
+                            marker_color=["green", "orange", "red"]),
+                    1, 1
+        )
+
+        fig.add_trace(
+            go.Bar(x=df_critagg["Critical Component"], y=df_critagg["count"], text=df_critagg["count"],
+                            marker_color=px.colors.qualitative.G10),
+                    1, 2
+        )
+
+        fig.update_layout(height=300, width=800, title_text="Number of Categories and Critical Components", showlegend=False,)
+        fig.update_layout(margin=dict(t=40, b=10))
+        chart(fig)
+
+        # ------------------------------------------------------------
+
+        fig = go.Figure()
+
+        features = numericals
+        for i in range(0, len(features)):
+
+            fig.add_trace(go.Box(
+                y=df[features[i]],
+                name=features[i],
+                boxpoints='suspectedoutliers', # only suspected outliers
+                marker=dict(
+                    color='rgb(8,81,156)',
+                    outliercolor='rgba(219, 64, 82, 0.6)',
+                    line=dict(
+                        outliercolor='rgba(219, 64, 82, 0.6)',
+                        outlierwidth=2)),
+                line_color='rgb(8,81,156)'
+            ))
+
+
+        fig.update_layout(title_text="Box Plot Styling Outliers")
+        fig.layout.plot_bgcolor = "light grey"
+        fig.update_layout(margin=dict(t=40, b=10))
+        chart(fig)
+
+
+    row11_spacer1, row11_1, row11_spacer2, row11_2, row11_spacer3  = st.columns((.2, 4.4, 0.1, 4.4, .2))
+    with row11_1:
+        st.markdown("""
+            **Observation:**
+            * There are 3 air qualities in the data
+            * Good air quality is the highest air quality detected in 2020 in Yogyakarta at 80%
+            * Seen less/unhealthy air quality, too small in 2020
+            * CO, O3 and PM10 dominate the category in terms of critical value
+        """) 
+    with row11_2:
+        st.markdown("""
+            **Observations:**
+             * It can be seen that there are outliers detected in some columns
+             * Except for column NO2, because it contains only 0 (zero) data
+             * However, this oulier data will not be discarded because we want to know the quality of the air produced
+        """)
+
+
+def pollutant_histogram_figure(df, x_axis_val):
+    plot = px.histogram(df.sort_values("Category"), x=x_axis_val, color="Category", 
+                   facet_col="Category",
+                   color_discrete_sequence=["green", "orange", "red"],
+                   title="Distribution of {} values to Category".format(x_axis_val))
+
+    plot.update_layout(margin=dict(t=60, b=10))
+    plot.layout.plot_bgcolor = "light grey"
+    return plot
+
+
+@section("pollutant_distribution", inputs=("ispu_jogja",), widgets=("critical_component",), lazy=ISPU_GROUP)
+def pollutant_distribution():
+    version, df = daily_readings()
+
+    row12_spacer1, row12_1, row12_spacer2 = st.columns((.2, 7.1, .2))
+    with row12_1:
+        x_axis_val = row12_1.selectbox('Select the Critical Components', options=numericals, key="critical_component")
+
+        plot = cached_figure("pollutant_distribution", ("ispu_jogja",), [x_axis_val],
+                             lambda: pollutant_histogram_figure(df, x_axis_val), version=version)
+        chart(plot)
+
+
+def pollutant_scatter_figure(df, x_axis_val, y_axis_val):
+    fig = px.scatter(df.sort_values("Category"), x=x_axis_val, y=y_axis_val, color="Category",
+                    color_discrete_sequence=["green", "orange", "red"],
+                    title="Correlation Category between {} dan {}".format(x_axis_val, y_axis_val))
+    fig.update_layout(margin=dict(t=60, b=10))
+    fig.layout.plot_bgcolor = "light grey"
+    # a point cloud, min/max bucketing keeps the outliers
+    return decimate(fig, method="minmax")
+
+
+@section("pollutant_correlation", inputs=("ispu_jogja",), widgets=("x_axis", "y_axis"), lazy=ISPU_GROUP)
+def pollutant_correlation():
+    version, df = daily_readings()
+
+    # Correlation
+    st.subheader('Correlation Between Air Particles (Critical)')
+
+    row13_spacer1, row13_1, row13_2, row13_3, row13_spacer2 = st.columns((.2, 1,3,1, .2))
+    with row13_1:
+        x_axis_val = row13_1.selectbox('Select the X-axis', options=numericals, index=2, key="x_axis")
+        y_axis_val = row13_1.selectbox('Select the Y-axis', options=numericals, index=1, key="y_axis")
+
+    with row13_2:
+        fig = cached_figure("pollutant_scatter", ("ispu_jogja",), [x_axis_val, y_axis_val],
+                            lambda: pollutant_scatter_figure(df, x_axis_val, y_axis_val), version=version)
+        chart(fig)
+
+    with row13_3:
+        engine = correlations("ispu_jogja", numericals, df, version, daily_summary()[1])
+        corr_part = engine.pair(x_axis_val, y_axis_val)
+        st.markdown('##### Correlation between {} and {} (*Pearson*)'.format(x_axis_val, y_axis_val))
+        percent = round(corr_part[0]*100,2)
+
+        if np.isnan(percent):
+            # constant column (e.g. NO2 is all zero), the coefficient is undefined
+            percent_status = 'Undefined (Constant Column)'
+        elif percent > 50:
+            percent_status = 'High Correlation'
+        elif percent > 30:
+            percent_status = 'Medium Correlation'
+        else:
+            percent_status = 'Low Correlation'
+
+        st.subheader('n/a' if np.isnan(percent) else f'{percent}%')
+        st.markdown(f'##### ***{percent_status}***')
+
+
+def feature_importance_figure(ft, method):
+    ft = ft.rename(columns={"feature": "category"})
+    ft["score"] = ft["score"].round(decimals = 2)
+    ft["error_plus"] = ft["ci_high"] - ft["score"]
+    ft["error_minus"] = ft["score"] - ft["ci_low"]
+
+    # Plotting the ranks
+    fig = px.bar(ft,
+                x="category", y="score",
+                color="category",
+                color_discrete_sequence=px.colors.qualitative.G10,
+                text="score",
+                error_y="error_plus", error_y_minus="error_minus",
+                title=f"Score Feature Important ({IMPORTANCE_LABELS[method]})")
+
+    fig.update_layout(margin=dict(t=60, b=10))
+    return fig
+
+
+@section("pollutant_heatmap_and_features", inputs=("ispu_jogja",), widgets=("importance_method",),
+         lazy=ISPU_GROUP)
+def pollutant_heatmap_and_features():
+    version, df = daily_readings()
+
+    row13_spacer1, row13_1, row13_spacer2, row13_2, row13_spacer3  = st.columns((.2, 6.4, 0.1, 4.4, .2))
+    with row13_1:
+        engine = correlations("ispu_jogja", numericals, df, version, daily_summary()[1])
+        df_corr = engine.matrix("pearson")
+        x = list(df_corr.columns)
+        y = list(df_corr.index)
+        z = np.array(df_corr)
+
+        fig = px.imshow(z, x=x, y=y, color_continuous_scale='Viridis', aspect="auto")
+        fig.update_traces(text=np.around(z, decimals=2), texttemplate="%{text}")
+        fig.update_xaxes(side="top")
+        fig.update_layout(margin=dict(t=60, b=10))
+        chart(fig)
+    with row13_2:
+        method = st.selectbox('Importance method', options=METHODS, format_func=IMPORTANCE_LABELS.get,
+                              key="importance_method")
+        importance = feature_importance("ispu_jogja", numericals, "Category", df, version)
+        if importance.computed(method) or method not in EXPENSIVE:
+            ft = importance.scores(method)
+        else:
+            with st.spinner(f'Computing {IMPORTANCE_LABELS[method].lower()}...'):
+                ft = importance.scores(method)
+        fig = cached_figure("feature_importance", (), [method], lambda: feature_importance_figure(ft, method),
+                            version=version)
+        chart(fig)
+        spread = f"{PERMUTATION_REPEATS} shuffles" if method == "permutation" else f"{BOOTSTRAP} bootstrap resamples"
+        st.caption(f"Bars show {CONFIDENCE:.0%} intervals over {spread} of the {importance.n} days.")
+
+
+#############################################################
+# 03. Co2 Emissions and Economic.ipynb
+#############################################################
+
+@section("co2_header", inputs=())
+def co2_header():
+    row14_spacer1, row14_1, row14_spacer2 = st.columns((.2, 7.1, .2))
+    with row14_1:
+        st.subheader('CO2 Emissions and Economic')
+        st.markdown("##### _Should Indonesia implement a Carbon Emissions Tax and its relationship to GDP per capita?_")
+        st.markdown("##### _How it decreases carbon tax emission and supports economic growth?_")
+        st.markdown('')
+
+
+ENERGY_TYPES = {"Fossil_Energy": "Fossil", "Nuclear_Energy": "Nuclear", "Renewable_Electricity": "Renewable"}
+
+
+def _range_widgets(sums, key):
+    # year range and regions of a range_sums.py source; no regions means all of them
+    years = st.slider('Years', sums.first_year, sums.last_year, (sums.first_year, sums.last_year),
+                      key=key + "_years")
+    regions = st.multiselect('Regions', options=sums.names, key=key + "_regions", placeholder="All regions")
+    return years, regions
+
+
+def _range_label(years, regions):
+    return f"{years[0]}-{years[1]}" + (f", {countries_label(regions)}" if regions else "")
+
+
+@section("energy_and_emissions", inputs=("electricity", "co2_annual"),
+         widgets=("energy_years", "energy_regions", "co2_years", "co2_regions"), lazy=CO2_GROUP)
+def energy_and_emissions():
+    energy = range_sums("electricity")
+    co2 = range_sums("co2_annual")
+
+    row14_spacer1, row14_1, row14_spacer2, row14_2, row14_spacer3  = st.columns((.2, 6.4, 0.1, 6.4, .2))
+    with row14_1:
+        years, regions = _range_widgets(energy, "energy")
+        if years == (energy.first_year, energy.last_year) and not regions:
+            chart(static_figure("energy_mix"))
+        else:
+            fig = cached_figure("energy_mix_range", ("electricity",), [years, *regions],
+                                lambda: energy_mix_figure(energy_mix_frame(energy.yearly(regions or None, *years)),
+                                                          title=f'Generated Electricity (TW) {_range_label(years, regions)}'))
+            chart(fig)
+        shares = energy.shares(regions or None, *years)
+        st.caption("Share of generated electricity: " + ", ".join(
+            f"{ENERGY_TYPES[name]} {share:.1%}" if pd.notna(share) else f"{ENERGY_TYPES[name]} n/a"
+            for name, share in shares.items()))
+
+    with row14_2:
+        years, regions = _range_widgets(co2, "co2")
+        if years == (co2.first_year, co2.last_year) and not regions:
+            chart(static_figure("co2_by_year"))
+        else:
+            fig = cached_figure("co2_by_year_range", ("co2_annual",), [years, *regions],
+                                lambda: co2_by_year_figure(co2.yearly(regions or None, *years),
+                                                           title=f'Annual Co2 Emissions from fossil fuel {_range_label(years, regions)}'))
+            chart(fig)
+        total = co2.totals(regions or None, *years)["Co2Emissions"]
+        st.caption(f"Total emissions {_range_label(years, regions)}: {human_format(total)} tonnes")
+
+
+    row15_spacer1, row15_1, row15_spacer2  = st.columns((.2, 7.1, .2))
+    with row15_1:
+        st.markdown("""
+            **Fossil fuel** has been the world’s primary source of **electricity**.
+
+            The majority or 50% of the installed capacity of power plants in Indonesia still comes from fossil energy. The need for electrical energy from year to year continues to increase in line with the increasing rate of economic growth, population, and the development of the industrial sector. 
+
+            The use of fossil energy will produce waste in the form of CO2 gas which causes infrared radiation from the earth to return to the earth's surface so that it can cause global warming. In addition, the use of fossil energy as the main source of power generation can also result in depletion of natural resource reserves, such as oil, coal, and gas.
+        """)
+
+
+@section("carbon_tax", inputs=("gdp_co2",), lazy=CO2_GROUP)
+def carbon_tax():
+    # Annual GDP Vs Co2 Emissions Per Capita
+
+    row16_spacer1, row16_1, row16_spacer2 = st.columns((.2, 7.1, .2))
+    with row16_1:
+        st.markdown('### **Carbon Tax**')
+        st.markdown('**Carbon tax** is a tax levied on the burning of carbon-based fuels such as coal, oil and gas. The carbon tax is a core policy created to reduce and eliminate the use of fossil fuels whose burning can damage the climate.')
+
+
+    row17_spacer1, row17_1, row17_spacer2, row17_2, row17_spacer3  = st.columns((.2, 6.4, 0.1, 6.4, .2))
+    with row17_1:
+        chart(static_figure("gdp_co2_uk"))
+
+    with row17_2:
+        chart(static_figure("gdp_co2_sweden"))
+
+
+    row18_spacer1, row18_1, row18_spacer2 = st.columns((.2, 7.1, .2))
+    with row18_1:
+        st.markdown("""
+        **Summary** : After Implementation of ***Carbon Tax***, *UK* and *Sweden* Experience Increased Economic Activity (GDP) 👍 and Decreased Carbon Emissions 🔻
+
+        Some 40 countries and more than 20 cities, states and provinces already use carbon pricing mechanisms, with more planning to implement them in the future.
+        https://www.worldbank.org/en/programs/pricing-carbon
+        """)
+
+
+
+    row19_spacer1, row19_1, row19_spacer2 = st.columns((.2, 7.1, .2))
+    with row19_1:
+        st.markdown('### **No Carbon Tax**')
+
+
+    row20_spacer1, row20_1, row20_spacer2, row20_2, row20_spacer3  = st.columns((.2, 6.4, 0.1, 6.4, .2))
+    with row20_1:
+        chart(static_figure("gdp_co2_indonesia"))
+
+    with row20_2:
+        chart(static_figure("gdp_co2_india"))
+
+    row21_spacer1, row21_1, row21_spacer2 = st.columns((.2, 7.1, .2))
+    with row21_1:
+        st.markdown("""
+        **Summary** : After seeing the increase in the value of Indonesia and India, Compared to the UK and Sweden which implemented the Carbon Tax, **India and Indonesia's Carbon Emissions increased also related to the increase**
+        Putting a price on carbon can encourage low-carbon growth and lower greenhouse gas emissions. Putting a Price Tag on Carbon Reduces Carbon Emission and Supports Economic Growth.
+        """)
+
+
+def scenario_figure(series, columns=4):
+    # one panel per country, its CO2 per capita scaled onto the GDP axis; traces
+    # are added in one call, px facets take seconds for dozens of countries
+    groups = list(series.groupby("Country", observed=True, sort=True))
+    rows = max(-(-len(groups) // columns), 1)
+    fig = make_subplots(rows=rows, cols=columns, subplot_titles=[name for name, _ in groups],
+                        vertical_spacing=min(0.08, 0.5 / rows), horizontal_spacing=0.05)
+
+    traces, trace_rows, trace_cols = [], [], []
+    for i, (name, gco) in enumerate(groups):
+        for column, label, color in (("CO2", "CO2/Capita", px.colors.qualitative.Plotly[0]),
+                                     ("GDP", "GDP/Capita", px.colors.qualitative.Plotly[1])):
+            traces.append(go.Scatter(x=gco["Year"].to_numpy(), y=gco[column].to_numpy(),
+                                     mode='lines', name=label, legendgroup=label,
+                                     showlegend=i == 0, line_color=color))
+            trace_rows.append(i // columns + 1)
+            trace_cols.append(i % columns + 1)
+    fig.add_traces(traces, rows=trace_rows, cols=trace_cols)
+
+    fig.update_layout(title='Annual GDP Vs Co2 Emissions Per Capita by Country', height=100 + 220 * rows)
+    fig.update_layout(margin=dict(t=60, b=10))
+    fig.layout.plot_bgcolor = "light grey"
+    return fig
+
+
+@section("carbon_tax_scenarios", inputs=("gdp_co2",), widgets=("tax_countries",), lazy=CO2_GROUP)
+def carbon_tax_scenarios():
+    panel = gdp_co2_panel()
+
+    row23_spacer1, row23_1, row23_spacer2 = st.columns((.2, 7.1, .2))
+    with row23_1:
+        st.markdown('### **Compare Countries**')
+        st.markdown("Scale each country's CO2 emissions per capita onto its GDP per capita from any year. "
+                    "Leave the multiplier empty to fit it to the country's GDP.")
+        countries = st.multiselect('Select the Countries', options=panel.names,
+                                   default=DEFAULT_SCENARIOS["Country"].tolist(), key="tax_countries")
+        if not countries:
+            return
+        scenarios = st.data_editor(
+            scenario_table(countries), hide_index=True, disabled=["Country"], use_container_width=True,
+            column_config={
+                "Multiplier": st.column_config.NumberColumn(min_value=0, help="Empty: fitted to the GDP axis"),
+                "Since": st.column_config.NumberColumn(min_value=1960, max_value=2018, step=1, format="%d"),
+            })
+
+        series = scenario_series(panel.select(countries), scenarios)
+        params = [tuple(None if pd.isna(value) else value for value in row)
+                  for row in scenarios[COLUMNS].itertuples(index=False)]
+        fig = cached_figure("carbon_tax_scenarios", ("gdp", "co2_per_capita"), params,
+                            lambda: scenario_figure(series))
+        chart(fig)
+        st.dataframe(scenario_summary(series), use_container_width=True)
+
+        with st.expander('Correlation and decoupling of every country'):
+            st.caption("Over every year with GDP and CO2 data. Elasticity: % change of CO2 per capita for 1% of GDP "
+                       "per capita. Trends in % per year; decoupling is absolute when GDP grows while CO2 falls, "
+                       "relative when CO2 per unit of GDP falls.")
+            st.dataframe(panel.statistics().round(3), use_container_width=True)
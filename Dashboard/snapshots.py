@@ -0,0 +1,101 @@
+"""
+Columnar snapshots of the CSV files under data/.
+
+Each dataset registered in data_loader.DATASETS is converted to an uncompressed
+Feather (Arrow IPC) file in data/snapshots/. The file carries the SHA-1 of the
+CSV it was built from and the read options (schema) it was parsed with, so a
+snapshot is only used while it matches both; otherwise the loader falls back
+to the CSV and rewrites the snapshot.
+
+Snapshots are read through a memory map, which makes numeric columns zero-copy
+and keeps cold start independent of text parsing.
+
+Build all snapshots up front with:
+
+    python Dashboard/snapshots.py
+"""
+import os
+import sys
+
+try:
+    import pyarrow as pa
+    import pyarrow.feather as feather
+except ImportError:  # snapshots are an optimisation, CSV still works without pyarrow
+    pa = None
+    feather = None
+
+import data_loader
+
+
+SNAPSHOT_DIR = os.path.join(data_loader.DATA_DIR, "snapshots")
+
+_DIGEST_KEY = b"source_sha1"
+_OPTIONS_KEY = b"read_options"
+
+
+def _options(name):
+    return repr(data_loader.DATASETS[name][1]).encode()
+
+
+def available():
+    return pa is not None
+
+
+def snapshot_path(name):
+    return os.path.normpath(os.path.join(SNAPSHOT_DIR, name + ".feather"))
+
+
+def read_snapshot(name, digest):
+    """Return the snapshot for ``name`` or None when it is missing or stale."""
+    path = snapshot_path(name)
+    if not available() or not os.path.exists(path):
+        return None
+    try:
+        table = feather.read_table(path, memory_map=True)
+    except (OSError, pa.ArrowInvalid):
+        return None
+    metadata = table.schema.metadata or {}
+    if metadata.get(_DIGEST_KEY, b"").decode() != digest or metadata.get(_OPTIONS_KEY) != _options(name):
+        return None
+    return table.to_pandas(split_blocks=True)
+
+
+def write_snapshot(name, frame, digest):
+    """Write ``frame`` as the snapshot of ``name``; returns False if it could not."""
+    if not available():
+        return False
+    table = pa.Table.from_pandas(frame, preserve_index=False)
+    metadata = dict(table.schema.metadata or {})
+    metadata[_DIGEST_KEY] = digest.encode()
+    metadata[_OPTIONS_KEY] = _options(name)
+    table = table.replace_schema_metadata(metadata)
+
+    path = snapshot_path(name)
+    tmp = path + ".tmp"
+    try:
+        os.makedirs(SNAPSHOT_DIR, exist_ok=True)
+        # uncompressed so the file can be memory-mapped without decoding
+        feather.write_feather(table, tmp, compression="uncompressed")
+        os.replace(tmp, path)
+    except OSError:
+        return False
+    return True
+
+
+def build_all(force=False):
+    """Convert every registered CSV; returns the names that were (re)written."""
+    written = []
+    for name in data_loader.DATASETS:
+        digest = data_loader._file_digest(data_loader.dataset_path(name))
+        if not force and read_snapshot(name, digest) is not None:
+            continue
+        if write_snapshot(name, data_loader.read_csv(name), digest):
+            written.append(name)
+    return written
+
+
+if __name__ == "__main__":
+    if not available():
+        sys.exit("pyarrow is required to build snapshots")
+    for name in build_all(force="--force" in sys.argv):
+        print(f"{name} -> {snapshot_path(name)}")
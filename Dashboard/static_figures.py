@@ -0,0 +1,385 @@
+"""
+Pre-rendered figures for the parts of the homepage no widget changes.
+
+Each figure in FIGURES is drawn only from its source datasets, so for a given
+version of them it is the same for every visitor. ``build_all`` renders them
+in a process pool and writes each one to data/figures/ as plotly JSON (served
+by the dashboard) and standalone HTML (for sharing or embedding):
+
+    python Dashboard/static_figures.py --jobs 4
+
+``static_figure(name)`` serves the JSON artifact while it matches the current
+data ("snapshot mode"), and otherwise builds the figure once per process
+through the figure cache. DASHBOARD_STATIC_FIGURES=live skips the artifacts.
+Charts driven by widgets, or by the live ISPU feed and store, are still
+computed in sections.py.
+"""
+import argparse
+import hashlib
+import json
+import os
+import sys
+import threading
+from concurrent.futures import ProcessPoolExecutor
+
+import plotly.express as px
+import plotly.graph_objs as go
+
+import data_loader
+from aggregates import data_version, get_view
+from carbon_tax import DEFAULT_SCENARIOS, scenario_series
+from decoupling import correlation_label, gdp_co2_panel
+from decimation import MAX_POINTS, WEBGL_POINTS, decimate
+from figure_cache import cached_figure
+from formatting import human_format
+from instrumentation import measured
+
+
+# bump when a builder below changes, so stale artifacts are not served
+FIGURES_VERSION = "3"
+
+ARTIFACT_DIR = os.path.join(data_loader.DATA_DIR, "figures")
+
+FIGURES = {}  # name -> (source datasets, builder)
+
+
+def static(name, inputs):
+    """Register ``build`` as the figure ``name`` drawn from datasets ``inputs``."""
+    def register(build):
+        FIGURES[name] = (inputs, build)
+        return build
+    return register
+
+
+# ------------------------------------
+# 02. IQAir rankings
+
+@static("top20_countries", inputs=("aqi_countries",))
+def _top20_countries():
+    top_10_country = get_view("top20_countries")
+    fig1= px.bar(top_10_country, y='Country/Region',
+                x='Rank_new', color='2021',
+                title="Top 20 Polluted Country In World",
+                text='2021',
+                hover_data={'Rank_new':False, 'Rank':True, 'Population':True},
+                height=490)
+    fig1.layout.plot_bgcolor = "white"
+    fig1.add_vline(
+        x=13.1, line_width=3, line_dash="dash",
+        line_color="green", annotation_text="Threshold Good",
+        annotation_font_color="black",
+    )
+    fig1.update_layout(margin=dict(t=40, b=10))
+    fig1.update_xaxes(visible=False, showticklabels=False)
+    return fig1
+
+
+@static("top11_17_yearly", inputs=("aqi_countries",))
+def _top11_17_yearly():
+    top_10_country = get_view("top11_17_yearly")
+
+    fig2= px.line(top_10_country, y='AQI',
+                x='Year',
+                color='Country/Region',
+                title="Top 11-17 Yearly Air Quality Index",
+                symbol='Country/Region',
+                text="AQI",height=550)
+    fig2.for_each_trace(lambda t: t.update(textfont_color="black", textposition='top right'))
+    fig2.layout.plot_bgcolor = "light grey"
+    fig2.add_hrect(y0=23, y1=50,
+              annotation_text="Good", annotation_position="top left",
+              annotation_font_color="black",
+              fillcolor="green", opacity=0.15, line_width=0)
+    fig2.update_yaxes(visible=False, showticklabels=False, )
+    fig2.update_layout(margin=dict(t=40, b=10))
+    return fig2
+
+
+@static("top10_population", inputs=("aqi_countries",))
+def _top10_population():
+    top_10_country = get_view("top10_population").copy()
+    top_10_country["text"] = human_format(top_10_country["Population"])
+    fig1= px.bar(top_10_country,
+                x="Country/Region",
+                y="Population",
+                color='Country/Region',
+                text="text",
+                title="Top 10 Population Country In World")
+    fig1.layout.plot_bgcolor = "white"
+    fig1.update_layout(margin=dict(t=40, b=10))
+    return fig1
+
+
+# ------------------------------------
+# 04. Additional data
+
+@static("vehicles_by_year", inputs=("vehicles",))
+def _vehicles_by_year():
+    df_kendaraan2 = data_loader.load_dataset("vehicles").copy()
+    df_kendaraan2 = df_kendaraan2.melt(id_vars='Year', value_vars=["Mobil Penumpang", "Mobil Bis", "Mobil Barang", "Sepeda motor", "Jumlah"],
+                                    var_name='Jenis', value_name='Jumlah')
+
+    df_kendaraan2["text"] = human_format(df_kendaraan2["Jumlah"])
+    df_kendaraan2["Jenis"] = df_kendaraan2["Jenis"].apply(lambda x: "Total" if x == "Jumlah" else x)
+
+    fig2= px.line(df_kendaraan2, y='Jumlah',
+                x='Year',
+                color='Jenis',
+                title="Number of Vehicles in Indonesia",
+                symbol='Jenis',
+                text="text")
+
+    fig2.for_each_trace(lambda t: t.update(textfont_color="black", textposition='bottom right'))
+    fig2.layout.plot_bgcolor = "light grey"
+    fig2.update_layout(margin=dict(t=40, b=10))
+    return fig2
+
+
+@static("vehicles_by_province", inputs=("vehicles_province",))
+def _vehicles_by_province():
+    df_kendaraan_prov = data_loader.load_dataset("vehicles_province")
+    df_kendaraan_prov2 = df_kendaraan_prov[["Year", "Province", "Jumlah"]].copy()
+    df_kendaraan_prov2 = df_kendaraan_prov2.sort_values("Jumlah", ascending=False).reset_index(drop=True)
+    df_kendaraan_prov2 = df_kendaraan_prov2[(df_kendaraan_prov2["Province"] != "Indonesia") & (df_kendaraan_prov2["Year"] == 2021)].reset_index(drop=True)
+    df_kendaraan_prov2["text"] = human_format(df_kendaraan_prov2["Jumlah"])
+
+    fig = px.bar(df_kendaraan_prov2.head(10),
+                x = 'Province',
+                y = 'Jumlah',
+                labels = {'Province': 'Province'},
+                color = 'Jumlah',
+                text = 'text',
+                title = "Indonesia Vehicles by Province",
+                height=470
+    )
+
+    # plot background white
+    fig.layout.plot_bgcolor = "white"
+    fig.update_layout(margin=dict(t=40, b=10))
+    return fig
+
+
+# ------------------------------------
+# 03. CO2 emissions and economic
+
+def energy_mix_figure(energy, title='Generated Electricity (TW) 1985- 2020'):
+    # Generated Electricity (TW) 1985- 2020, or a range/region of range_sums.py
+    fig = px.area(energy, x="Year", y="Energy", color="Energy Type", line_group="Energy Type")
+
+    fig.update_layout(title=title,
+                    xaxis_title='Year',
+                    yaxis_title='Generated Electricity (TW)')
+
+    fig.update_layout(margin=dict(t=60, b=10))
+    fig.layout.plot_bgcolor = "light grey"
+    return fig
+
+
+def co2_by_year_figure(co2ann, title='Annual Global Co2 Emissions from fossil fuel 1900-2020'):
+    # Annual Global Co2 Emissions from fossil fuel 1900-2020, or a range/region of range_sums.py
+    fig = px.area(co2ann, x="Year", y="Co2Emissions")
+
+    fig.update_layout(title=title,
+                    xaxis_title='Year',
+                    yaxis_title='CO2 Emissions')
+    fig.update_layout(margin=dict(t=60, b=10))
+    fig.layout.plot_bgcolor = "light grey"
+    return fig
+
+
+@static("energy_mix", inputs=("electricity",))
+def _energy_mix():
+    return energy_mix_figure(get_view("energy_mix"))
+
+
+@static("co2_by_year", inputs=("co2_annual",))
+def _co2_by_year():
+    return co2_by_year_figure(get_view("co2_by_year"))
+
+
+def _gdp_co2_figure(country, title, annotations, note):
+    # Annual GDP Vs Co2 Emissions Per Capita in ``country``, with its default scenario
+    panel = gdp_co2_panel()
+    gco = scenario_series(panel.select([country]), DEFAULT_SCENARIOS[DEFAULT_SCENARIOS["Country"] == country])
+    # over every reported year of the country, as in notebook 03
+    correlation = correlation_label(panel.statistics().at[country, "r"])
+
+    fig = go.Figure()
+    fig.add_trace(go.Scatter(x=gco["Year"], y=gco["CO2"],
+                        mode='lines+markers',
+                        name='CO2/Capita'))
+    fig.add_trace(go.Scatter(x=gco["Year"], y=gco["GDP"],
+                        mode='lines+markers',
+                        name='GDP/Capita'))
+
+    # Edit the layout
+    fig.update_layout(title=title,
+                    xaxis_title='Year',
+                    yaxis_title='GDP/Capita')
+    for annotation in annotations:
+        fig.add_annotation(showarrow=True, arrowcolor="#636363",
+                    ay=-90,
+                    bordercolor="#c7c7c7",
+                    borderwidth=2,
+                    borderpad=4,
+                    bgcolor="#ff7f0e",
+                    opacity=0.8,
+                    **annotation)
+
+    fig.update_layout(
+            xaxis=go.layout.XAxis(
+            title=go.layout.xaxis.Title(
+                text=note.format(correlation=correlation)
+                )
+            )
+        )
+
+    fig.update_layout(margin=dict(t=60, b=10))
+    fig.layout.plot_bgcolor = "light grey"
+    return decimate(fig)
+
+
+@static("gdp_co2_uk", inputs=("gdp", "co2_per_capita"))
+def _gdp_co2_uk():
+    return _gdp_co2_figure(
+        "United Kingdom", 'Annual GDP Vs Co2 Emissions Per Capita In the United Kingdom',
+        [dict(x=2003.2, y=36500, text="EU ETS, 2005*", ax=-30, arrowhead=7),
+         dict(x=2013, y=44000, text="UK CPS, 2013**", ax=-30, arrowhead=7)],
+        """
+                Year
+                <br><br><sup>*The European Union Emissions Trading System (EU ETS) is a  form of Carbon Pricing.</sup>
+                <br><sup>** UK Carbon Price Support (CPS) is an additonal form of Carbon Pricing.</sup>
+                <br><sup>Correlation Coefficient = {correlation}</sup>
+                """)
+
+
+@static("gdp_co2_sweden", inputs=("gdp", "co2_per_capita"))
+def _gdp_co2_sweden():
+    return _gdp_co2_figure(
+        "Sweden", 'Annual GDP Vs Co2 Emissions Per Capita In the Sweden',
+        [dict(x=1991, y=28000, text="Carbon Tax, 1991*", ax=0, arrowhead=1)],
+        """
+                Year
+                <br><br><sup>*Carbon Tax Implementation Started on 1991
+                <br>Correlation Coefficient = {correlation}</sup>
+                """)
+
+
+@static("gdp_co2_indonesia", inputs=("gdp", "co2_per_capita"))
+def _gdp_co2_indonesia():
+    return _gdp_co2_figure(
+        "Indonesia", 'Annual GDP Vs Co2 Emissions Per Capita In the Indonesia', [],
+        """
+                Year
+                <br><br><sup>Correlation Coefficient of GDP and Co2 Emissions in Indonesia</sup>
+                <br><sup>= {correlation}</sup>
+                """)
+
+
+@static("gdp_co2_india", inputs=("gdp", "co2_per_capita"))
+def _gdp_co2_india():
+    return _gdp_co2_figure(
+        "India", 'Annual GDP Vs Co2 Emissions Per Capita In the India', [],
+        """
+                Year
+                <br><br><sup>Correlation Coefficient of GDP and Co2 Emissions in India</sup>
+                <br><sup>= {correlation}</sup>
+                """)
+
+
+# ------------------------------------
+# Artifacts
+
+_lock = threading.Lock()
+_payloads = {}  # name -> (version, parsed figure JSON)
+
+
+def clear_cache():
+    """Forget the artifacts read by this process."""
+    with _lock:
+        _payloads.clear()
+
+
+def figure_version(name):
+    """Changes with the figure's source data, its builder and the decimation limits."""
+    key = f"{FIGURES_VERSION}:{MAX_POINTS}:{WEBGL_POINTS}:{data_version(*FIGURES[name][0])}"
+    return hashlib.sha1(key.encode()).hexdigest()[:16]
+
+
+def artifact_path(name, version, ext="json"):
+    return os.path.join(ARTIFACT_DIR, f"{name}-{version}.{ext}")
+
+
+def _read_artifact(name, version):
+    with _lock:
+        cached = _payloads.get(name)
+        if cached is not None and cached[0] == version:
+            return cached[1]
+    try:
+        with open(artifact_path(name, version), encoding="utf-8") as f:
+            payload = json.load(f)
+    except (OSError, ValueError):
+        return None
+    with _lock:
+        _payloads[name] = (version, payload)
+    return payload
+
+
+@measured("figure")
+def static_figure(name):
+    """Figure ``name`` for the current data, from its artifact when there is one."""
+    version = figure_version(name)
+    if os.environ.get("DASHBOARD_STATIC_FIGURES", "snapshot") != "live":
+        payload = _read_artifact(name, version)
+        if payload is not None:
+            # written by plotly at build time, so skip validating it again
+            return go.Figure(payload, _validate=False)
+    return cached_figure(name, (), (), FIGURES[name][1], version=version)
+
+
+def build(name, force=False):
+    """Render ``name`` and write its artifacts; returns (name, version, written)."""
+    version = figure_version(name)
+    path = artifact_path(name, version)
+    if not force and os.path.exists(path):
+        return name, version, False
+    fig = FIGURES[name][1]()
+    os.makedirs(ARTIFACT_DIR, exist_ok=True)
+    with open(path + ".tmp", "w", encoding="utf-8") as f:
+        f.write(fig.to_json())
+    fig.write_html(artifact_path(name, version, "html") + ".tmp", include_plotlyjs="cdn", full_html=True)
+    os.replace(path + ".tmp", path)
+    os.replace(artifact_path(name, version, "html") + ".tmp", artifact_path(name, version, "html"))
+    for stale in os.listdir(ARTIFACT_DIR):
+        if stale.startswith(f"{name}-") and not stale.startswith(f"{name}-{version}."):
+            os.remove(os.path.join(ARTIFACT_DIR, stale))
+    return name, version, True
+
+
+def build_all(jobs=None, force=False):
+    """Render every figure in a process pool; returns [(name, version, written)]."""
+    from aggregates import build_all as build_views
+
+    # workers then read the views from disk instead of each computing them
+    build_views()
+    jobs = jobs or os.cpu_count() or 1
+    names = list(FIGURES)
+    if jobs == 1:
+        return [build(name, force) for name in names]
+    with ProcessPoolExecutor(max_workers=min(jobs, len(names))) as pool:
+        return list(pool.map(build, names, [force] * len(names)))
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--jobs", type=int, default=None, help="worker processes (default: one per CPU)")
+    parser.add_argument("--force", action="store_true", help="rewrite artifacts that are up to date")
+    args = parser.parse_args(argv)
+
+    for name, version, written in build_all(args.jobs, args.force):
+        print(f"{name:20s} {'written' if written else 'up to date'}  {artifact_path(name, version)}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
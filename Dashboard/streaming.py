@@ -0,0 +1,41 @@
+"""
+Chunked aggregation over CSV files too large to hold in memory.
+
+The file is read ``chunksize`` rows at a time, only the key/value columns are
+parsed, range filters are applied to each chunk before it is grouped, and only
+the running per-key sums are kept between chunks. Peak memory is therefore
+bounded by the chunk size and the number of distinct keys, not the file size.
+"""
+import pandas as pd
+
+
+def stream_sum(path, by, values, bounds=None, chunksize=100_000, **read_csv_kwargs):
+    """Sum ``values`` grouped by ``by`` over the CSV at ``path``.
+
+    ``by`` and ``values`` are column names or lists of them. ``bounds`` maps a
+    column to an inclusive ``(low, high)`` range (either end may be None); rows
+    outside it are dropped chunk by chunk, before any grouping. Returns a frame
+    with one row per key, sorted by key, like ``groupby(by)[values].sum()``
+    followed by ``reset_index()``.
+    """
+    by = [by] if isinstance(by, str) else list(by)
+    values = [values] if isinstance(values, str) else list(values)
+    bounds = bounds or {}
+    usecols = list(dict.fromkeys(by + values + list(bounds)))
+
+    totals = None
+    reader = pd.read_csv(path, usecols=usecols, chunksize=chunksize, **read_csv_kwargs)
+    for chunk in reader:
+        for column, (low, high) in bounds.items():
+            if low is not None:
+                chunk = chunk[chunk[column] >= low]
+            if high is not None:
+                chunk = chunk[chunk[column] <= high]
+        if chunk.empty:
+            continue
+        partial = chunk.groupby(by)[values].sum()
+        totals = partial if totals is None else totals.add(partial, fill_value=0)
+
+    if totals is None:
+        return pd.DataFrame(columns=by + values)
+    return totals.sort_index().reset_index()